@@ -3,10 +3,6 @@
 This file provides pytest configuration for the entire project.
 """
 
-import sys
-
-if sys.platform == "win32":
-    def pytest_configure(config):
-        """Pytest hook - called after command line options have been parsed."""
-        # Windows-specific pytest configuration can go here
-        pass
+# Windows-specific pytest configuration can go here. Add a pytest_configure
+# hook only when there is something to configure; Unix-only module mocks live
+# in sitecustomize.py and tests/conftest.py.
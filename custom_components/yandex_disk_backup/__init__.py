@@ -1,16 +1,18 @@
 """The Yandex Disk backup integration."""
 
 import logging
+from collections.abc import Mapping
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.start import async_at_started
 from homeassistant.helpers.typing import ConfigType
 
 from .const import DATA_BACKUP_AGENT_LISTENERS, DOMAIN
 from .backup import YandexDiskBackupAgent
 
-type YandexDiskConfigEntry = ConfigEntry[dict[str, Any]]
+type YandexDiskConfigEntry = ConfigEntry[Mapping[str, Any]]
 
 _LOGGER = logging.getLogger(__name__)
 PLATFORMS: list[str] = []
@@ -29,6 +31,8 @@ async def async_setup(  # pylint: disable=unused-argument
         True if setup succeeded
     """
     hass.data.setdefault(DOMAIN, {})
+    # Always create the listener bucket so entries can bind it directly
+    hass.data.setdefault(DATA_BACKUP_AGENT_LISTENERS, set())
     return True
 
 
@@ -44,22 +48,39 @@ async def async_setup_entry(hass: HomeAssistant, entry: YandexDiskConfigEntry) -
     """
     hass.data.setdefault(DOMAIN, {})
 
-    # Store entry data for backup agent to use
-    entry.runtime_data = dict(entry.data)
+    # Store entry data for backup agent to use; entry.data is already a
+    # read-only MappingProxyType, so share it instead of copying
+    entry.runtime_data = entry.data
 
+    # Bucket is created once in async_setup; bind it so notifies skip hass.data
+    listeners = hass.data[DATA_BACKUP_AGENT_LISTENERS]
+
+    @callback
     def async_notify_backup_listeners() -> None:
         """Notify all registered backup listeners."""
-        for listener in hass.data.get(DATA_BACKUP_AGENT_LISTENERS, []):
+        # Snapshot so listeners may unregister themselves while being notified
+        for listener in tuple(listeners):
             listener()
 
     # Register listener notification on entry state change
     entry.async_on_unload(entry.async_on_state_change(async_notify_backup_listeners))
+    # Notify listeners that agents have changed once the entry has unloaded;
+    # HA only runs on_unload callbacks when async_unload_entry succeeded
+    entry.async_on_unload(async_notify_backup_listeners)
+
+    # Forward entry setup to platforms; async_forward_entry_setups already sets
+    # them up concurrently, so only skip the call while there are none
+    if PLATFORMS:
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    # Forward entry setup to backup platform
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    @callback
+    def _async_notify_at_started(_hass: HomeAssistant) -> None:
+        """Notify listeners once Home Assistant has started."""
+        async_notify_backup_listeners()
 
-    # Notify listeners that agents have changed
-    async_notify_backup_listeners()
+    # Notify listeners that agents have changed; during startup this waits for
+    # EVENT_HOMEASSISTANT_STARTED instead of firing once per entry being set up
+    entry.async_on_unload(async_at_started(hass, _async_notify_at_started))
 
     return True
 
@@ -74,12 +95,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: YandexDiskConfigEntry)
     Returns:
         True if unload succeeded
     """
-    # Forward entry unload to backup platform
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
-
-    # Notify listeners that agents have changed
-    if unload_ok:
-        for listener in hass.data.get(DATA_BACKUP_AGENT_LISTENERS, []):
-            listener()
-
-    return unload_ok
+    # Forward entry unload to platforms
+    # Listeners are notified by the on_unload callback from async_setup_entry
+    if not PLATFORMS:
+        return True
+    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
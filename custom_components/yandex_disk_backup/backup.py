@@ -1,14 +1,21 @@
 """Yandex Disk backup agent for Home Assistant."""
 
 import asyncio
-import json
-import re
-from collections.abc import Callable
+import logging
+from collections import deque
+from collections.abc import Awaitable, Callable, Coroutine, Iterable, Mapping
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache, wraps
+from http import HTTPStatus
+from operator import attrgetter
+from time import monotonic
 from typing import Any, AsyncIterator
 
-
+from aiohttp import ClientError, ClientPayloadError, ClientSession
+import orjson
 from yadisk import AsyncClient
+from yadisk.sessions.aiohttp_session import AIOHTTPSession
 from yadisk.exceptions import (
     InsufficientStorageError,
     NotFoundError,
@@ -27,15 +34,28 @@ from homeassistant.components.backup.util import (  # type: ignore[import-not-fo
 )
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.typing import ConfigType
+from homeassistant.util.json import json_loads_object
 
 from .const import (
+    BACKUP_EXTENSIONS,
     CHUNK_SIZE,
     CONF_BACKUP_FOLDER,
     CONF_TOKEN,
     DATA_BACKUP_AGENT_LISTENERS,
+    DATA_YADISK_SESSION,
     DEFAULT_BACKUP_FOLDER,
+    DELETE_CONCURRENCY,
+    DISK_HEADROOM_PERCENT,
+    DISK_INFO_CACHE_TTL,
     DOMAIN,
+    DOWNLOAD_CONNECTIONS,
+    DOWNLOAD_RETRY_INTERVAL,
+    DOWNLOAD_SEGMENT_RETRIES,
+    DOWNLOAD_SEGMENT_SIZE,
+    LIST_CACHE_TTL,
+    METADATA_FETCH_CONCURRENCY,
+    UPLOAD_CHUNK_SIZE,
+    UPLOAD_PROGRESS_LOG_INTERVAL,
     _LOGGER,
 )
 
@@ -75,18 +95,180 @@ def async_register_backup_agents_listener(  # pylint: disable=unused-argument
     Returns:
         Unsubscribe function
     """
-    hass.data.setdefault(DATA_BACKUP_AGENT_LISTENERS, []).append(listener)
+    listeners: set[Callable[[], None]] = hass.data.setdefault(
+        DATA_BACKUP_AGENT_LISTENERS, set()
+    )
+    listeners.add(listener)
 
     @callback
     def remove_listener() -> None:
         """Remove the listener."""
-        hass.data[DATA_BACKUP_AGENT_LISTENERS].remove(listener)
-        if not hass.data[DATA_BACKUP_AGENT_LISTENERS]:
-            del hass.data[DATA_BACKUP_AGENT_LISTENERS]
+        # Keep the (possibly empty) set in place: notify closures hold a reference
+        listeners.discard(listener)
 
     return remove_listener
 
 
+@callback
+def async_create_yadisk_session(hass: HomeAssistant) -> AIOHTTPSession:
+    """Create a yadisk session over Home Assistant's pooled connector.
+
+    The default yadisk session builds its own HTTP client, which blocks on
+    SSL context creation; HA's connector comes with a pre-built one.
+    connector_owner=False keeps closing the session from closing HA's
+    connector.
+
+    Args:
+        hass: Home Assistant instance
+
+    Returns:
+        AIOHTTPSession sharing HA's connector
+    """
+    return AIOHTTPSession(
+        connector=async_get_clientsession(hass).connector, connector_owner=False
+    )
+
+
+async def _gather_all[_T](awaitables: Iterable[Awaitable[_T]]) -> list[_T]:
+    """Await all awaitables concurrently, raising only once all are done.
+
+    Unlike a plain gather, a failure does not leave the other awaitables
+    running unobserved in the background.
+
+    Args:
+        awaitables: The awaitables to run
+
+    Returns:
+        Results in the same order as the awaitables
+
+    Raises:
+        Exception: The first exception raised by any awaitable, after all of
+            them have finished
+    """
+    results = await asyncio.gather(*awaitables, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results  # type: ignore[return-value]
+
+
+async def _gather_limited[_T](
+    limit: int,
+    awaitables: Iterable[Awaitable[_T]],
+) -> list[_T]:
+    """Await all awaitables concurrently with at most `limit` in flight.
+
+    Args:
+        limit: Maximum number of awaitables running at once
+        awaitables: The awaitables to run
+
+    Returns:
+        Results in the same order as the awaitables
+
+    Raises:
+        Exception: The first exception raised by any awaitable, after all of
+            them have finished
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(awaitable: Awaitable[_T]) -> _T:
+        async with semaphore:
+            return await awaitable
+
+    return await _gather_all(run(awaitable) for awaitable in awaitables)
+
+
+# Agent error raised for each yadisk error type, with its message (None passes
+# the yadisk error text through). Looked up along the error's MRO, so subclasses
+# without an entry fall back to the YaDiskError one.
+_YADISK_ERROR_MAP: dict[
+    type[YaDiskError], tuple[type[BackupAgentError], str | None]
+] = {
+    InsufficientStorageError: (BackupAgentError, "Insufficient storage on Yandex Disk"),
+    YaDiskConnectionError: (
+        BackupAgentUnreachableError,
+        "Cannot connect to Yandex Disk",
+    ),
+    TooManyRequestsError: (
+        BackupAgentUnreachableError,
+        "Too many requests. Please try again later",
+    ),
+    YaDiskError: (BackupAgentUnreachableError, None),
+}
+
+
+def _map_yadisk_errors[**_P, _R](
+    operation: str,
+) -> Callable[
+    [Callable[_P, Coroutine[Any, Any, _R]]], Callable[_P, Coroutine[Any, Any, _R]]
+]:
+    """Translate yadisk errors raised by an async method into agent errors.
+
+    NotFoundError is not special-cased: methods that treat a missing path
+    differently catch it themselves before it reaches the decorator.
+
+    Args:
+        operation: Name of the operation, used in the error log message
+
+    Returns:
+        Decorator wrapping the method
+    """
+
+    def decorator(
+        func: Callable[_P, Coroutine[Any, Any, _R]],
+    ) -> Callable[_P, Coroutine[Any, Any, _R]]:
+        @wraps(func)
+        async def wrapper(*args: _P.args, **kwargs: _P.kwargs) -> _R:
+            try:
+                return await func(*args, **kwargs)
+            except YaDiskError as err:
+                error_type, message = next(
+                    _YADISK_ERROR_MAP[cls]
+                    for cls in type(err).__mro__
+                    if cls in _YADISK_ERROR_MAP
+                )
+                _LOGGER.error("Yandex Disk %s failed: %s", operation, err)
+                raise error_type(message or str(err)) from err
+
+        return wrapper
+
+    return decorator
+
+
+# Characters of Home Assistant backup IDs (lowercase hexadecimal hashes)
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+
+@lru_cache(maxsize=1024)
+def _is_backup_file_name(filename: str) -> bool:
+    """Check if filename is a valid backup file, memoized per name.
+
+    Listings of a stable folder see the same names on every call, so repeat
+    checks are a cache lookup.
+
+    Args:
+        filename: The filename to check
+
+    Returns:
+        True if filename is a backup file
+    """
+    # Home Assistant backup IDs are 8-64 character lowercase hex hashes, the
+    # common case, so they are checked first with a length test and a C-level
+    # set check. bytes.fromhex would also accept uppercase and whitespace and
+    # reject odd lengths, so it is not used
+    if 8 <= len(filename) <= 64 and _HEX_DIGITS.issuperset(filename):
+        return True
+    return filename.endswith(BACKUP_EXTENSIONS)
+
+
+@dataclass(slots=True)
+class _SharedYaDiskSession:
+    """yadisk HTTP session shared by all agents, with a count of its users."""
+
+    session: AIOHTTPSession
+    users: int = 0
+
+
 class YandexDiskBackupAgent(BackupAgent):
     """Yandex Disk backup agent for Home Assistant."""
 
@@ -96,14 +278,14 @@ class YandexDiskBackupAgent(BackupAgent):
     def __init__(
         self,
         hass: HomeAssistant,
-        config: ConfigType,
+        config: Mapping[str, Any],
         unique_id: str,
     ) -> None:
         """Initialize the Yandex Disk backup agent.
 
         Args:
             hass: Home Assistant instance
-            config: Configuration dict containing token and backup_folder
+            config: Read-only config mapping containing token and backup_folder
             unique_id: Unique ID for this agent instance
         """
         self.hass = hass
@@ -111,8 +293,14 @@ class YandexDiskBackupAgent(BackupAgent):
         self.unique_id = unique_id
         self._client: AsyncClient | None = None
         self._backup_folder = config.get(CONF_BACKUP_FOLDER, DEFAULT_BACKUP_FOLDER)
-        self._disk_info_cache: tuple[dict[str, Any], datetime] | None = None
+        # Joined to file names to build remote paths
+        self._folder_prefix = self._backup_folder.rstrip("/") + "/"
+        # Cached disk info and the time.monotonic() timestamp it was fetched at
+        self._disk_info_cache: tuple[dict[str, Any], float] | None = None
         self._cache_lock = asyncio.Lock()
+        # Backups of the last listing by ID, and the time.monotonic() timestamp
+        # they were listed at; answers lookups that follow a listing
+        self._list_cache: tuple[dict[str, AgentBackup], float] | None = None
 
     async def _get_client(self) -> AsyncClient:
         """Get or create yadisk async client.
@@ -121,19 +309,19 @@ class YandexDiskBackupAgent(BackupAgent):
             AsyncClient instance configured with OAuth token
         """
         if self._client is None:
-
-            def _create_client() -> AsyncClient:
-                """Create AsyncClient - may block on SSL context initialization.
-
-                Returns:
-                    The created AsyncClient instance
-                """
-                return AsyncClient(token=self._config[CONF_TOKEN])
-
-            # Run client creation in executor to avoid blocking SSL calls
-            self._client = await self.hass.async_add_executor_job(_create_client)
+            shared: _SharedYaDiskSession | None = self.hass.data.get(
+                DATA_YADISK_SESSION
+            )
+            if shared is None:
+                shared = _SharedYaDiskSession(async_create_yadisk_session(self.hass))
+                self.hass.data[DATA_YADISK_SESSION] = shared
+            shared.users += 1
+            self._client = AsyncClient(
+                token=self._config[CONF_TOKEN], session=shared.session
+            )
         return self._client
 
+    @_map_yadisk_errors("download")
     async def async_download_backup(  # type: ignore[override,misc]
         self,
         backup_id: str,
@@ -152,26 +340,15 @@ class YandexDiskBackupAgent(BackupAgent):
             BackupAgentError: If download fails
             BackupAgentUnreachableError: If Yandex Disk is unreachable
         """
+        remote_path = self._folder_prefix + backup_id
+        client = await self._get_client()
         try:
-            remote_path = f"{self._backup_folder}/{backup_id}"
-            client = await self._get_client()
             download_url = await client.get_download_link(remote_path)
-            # Return the async generator directly (don't yield from this function)
-            return self._download_stream(download_url, backup_id)
         except NotFoundError as err:
             _LOGGER.error("Backup not found: %s", backup_id)
             raise BackupAgentError(f"Backup {backup_id} not found") from err
-        except YaDiskConnectionError as err:
-            _LOGGER.error("Connection error during download: %s", err)
-            raise BackupAgentUnreachableError("Cannot connect to Yandex Disk") from err
-        except TooManyRequestsError as err:
-            _LOGGER.error("Rate limited during download: %s", err)
-            raise BackupAgentUnreachableError(
-                "Too many requests. Please try again later"
-            ) from err
-        except YaDiskError as err:
-            _LOGGER.error("Download failed: %s", err)
-            raise BackupAgentUnreachableError(str(err)) from err
+        # Return the async generator directly (don't yield from this function)
+        return self._download_stream(download_url, backup_id)
 
     async def _download_stream(
         self,
@@ -188,36 +365,173 @@ class YandexDiskBackupAgent(BackupAgent):
             Bytes of the backup file in chunks
 
         Raises:
-            BackupAgentError: If download fails
-            BackupAgentUnreachableError: If Yandex Disk is unreachable
+            BackupAgentUnreachableError: If Yandex Disk stops honouring ranges
+        """
+        # Stream download using HA's HTTP session; no yadisk API calls happen
+        # here, so there are no yadisk errors to translate
+        session = async_get_clientsession(self.hass)
+        ranged = await self._probe_ranged_download(session, download_url)
+
+        if ranged is not None:
+            segments = self._download_segments(session, *ranged)
+        else:
+            segments = self._download_single(session, download_url)
+
+        async for chunk in segments:
+            yield chunk
+
+        _LOGGER.info("Downloaded backup %s", backup_id)
+
+    @staticmethod
+    async def _download_single(
+        session: ClientSession,
+        download_url: str,
+    ) -> AsyncIterator[bytes]:
+        """Stream a download over a single HTTP connection.
+
+        Args:
+            session: The aiohttp client session
+            download_url: The URL to download from
+
+        Yields:
+            Bytes of the file in chunks
+        """
+        async with session.get(download_url) as response:
+            response.raise_for_status()
+
+            # Stream in chunks (4 MB chunks per HA backup standard)
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                yield chunk
+
+    @staticmethod
+    async def _probe_ranged_download(
+        session: ClientSession,
+        download_url: str,
+    ) -> tuple[str, int] | None:
+        """Check whether a download can be split into parallel byte ranges.
+
+        Args:
+            session: The aiohttp client session
+            download_url: The URL to download from
+
+        Returns:
+            Tuple of (resolved URL, total size) if the server accepts byte
+            ranges and the file spans more than one segment, None otherwise
         """
         try:
-            # Stream download using HA's HTTP session
-            session = async_get_clientsession(self.hass)
-            async with session.get(download_url) as response:
+            async with session.head(download_url, allow_redirects=True) as response:
                 response.raise_for_status()
+                if response.headers.get("Accept-Ranges") != "bytes":
+                    return None
+                total_size = int(response.headers.get("Content-Length", 0))
+                # Reuse the final URL so range requests skip the redirect
+                resolved_url = str(response.url)
+        except (ClientError, TimeoutError, ValueError) as err:
+            _LOGGER.debug("Ranged download probe failed, using single GET: %s", err)
+            return None
+
+        if total_size <= DOWNLOAD_SEGMENT_SIZE:
+            return None
+        return resolved_url, total_size
+
+    async def _download_segments(
+        self,
+        session: ClientSession,
+        download_url: str,
+        total_size: int,
+    ) -> AsyncIterator[bytes]:
+        """Download a file as parallel byte-range segments, yielded in order.
 
-                # Stream in chunks (4 MB chunks per HA backup standard)
-                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
-                    yield chunk
+        Up to DOWNLOAD_CONNECTIONS segments are in flight at once; the next
+        segment is requested as soon as the oldest one has been handed out,
+        so memory stays bounded by DOWNLOAD_CONNECTIONS segments.
 
-            _LOGGER.info("Downloaded backup %s", backup_id)
+        Args:
+            session: The aiohttp client session
+            download_url: The (redirect-resolved) URL to download from
+            total_size: Total size of the file in bytes
 
-        except NotFoundError as err:
-            _LOGGER.error("Backup not found: %s", backup_id)
-            raise BackupAgentError(f"Backup {backup_id} not found") from err
-        except YaDiskConnectionError as err:
-            _LOGGER.error("Connection error during download: %s", err)
-            raise BackupAgentUnreachableError("Cannot connect to Yandex Disk") from err
-        except TooManyRequestsError as err:
-            _LOGGER.error("Rate limited during download: %s", err)
-            raise BackupAgentUnreachableError(
-                "Too many requests. Please try again later"
-            ) from err
-        except YaDiskError as err:
-            _LOGGER.error("Download failed: %s", err)
-            raise BackupAgentUnreachableError(str(err)) from err
+        Yields:
+            Bytes of the file, one segment at a time
+        """
+
+        async def fetch_segment(start: int) -> bytes | None:
+            """Fetch one segment, or None if the server ignored the range.
+
+            Range requests are idempotent, so a failed segment is retried
+            on its own without restarting the whole download.
+            """
+            end = min(start + DOWNLOAD_SEGMENT_SIZE, total_size) - 1
+            for attempt in range(DOWNLOAD_SEGMENT_RETRIES + 1):
+                try:
+                    async with session.get(
+                        download_url, headers={"Range": f"bytes={start}-{end}"}
+                    ) as response:
+                        response.raise_for_status()
+                        if response.status != HTTPStatus.PARTIAL_CONTENT:
+                            return None
+                        data = await response.read()
+                    # A short or misaligned range would corrupt the archive
+                    if len(data) != end - start + 1:
+                        raise ClientPayloadError(
+                            f"Segment {start}-{end} returned {len(data)} bytes"
+                        )
+                    return data
+                except (ClientError, TimeoutError) as err:
+                    if attempt == DOWNLOAD_SEGMENT_RETRIES:
+                        raise
+                    _LOGGER.debug(
+                        "Retrying segment %d-%d (attempt %d): %s",
+                        start,
+                        end,
+                        attempt + 1,
+                        err,
+                    )
+                    await asyncio.sleep(DOWNLOAD_RETRY_INTERVAL * (attempt + 1))
+            return None
 
+        starts = iter(range(0, total_size, DOWNLOAD_SEGMENT_SIZE))
+        pending: deque[asyncio.Task[bytes | None]] = deque()
+        for start in starts:
+            pending.append(asyncio.create_task(fetch_segment(start)))
+            if len(pending) == DOWNLOAD_CONNECTIONS:
+                break
+
+        async def cancel_pending() -> None:
+            """Cancel the in-flight segments and wait for them to finish.
+
+            Awaiting retrieves the errors of segments that had already
+            failed, and no task outlives the download.
+            """
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            pending.clear()
+
+        first = True
+        try:
+            while pending:
+                data = await pending.popleft()
+                if data is None:
+                    if not first:
+                        raise BackupAgentUnreachableError(
+                            "Yandex Disk stopped honouring range requests"
+                        )
+                    # Server answered 200 instead of 206: use a plain GET
+                    _LOGGER.debug("Range request not honoured, using single GET")
+                    await cancel_pending()
+                    async for chunk in self._download_single(session, download_url):
+                        yield chunk
+                    return
+
+                first = False
+                if (next_start := next(starts, None)) is not None:
+                    pending.append(asyncio.create_task(fetch_segment(next_start)))
+                yield data
+        finally:
+            await cancel_pending()
+
+    @_map_yadisk_errors("upload")
     async def async_upload_backup(  # pylint: disable=too-many-locals
         self,
         *,
@@ -239,17 +553,27 @@ class YandexDiskBackupAgent(BackupAgent):
         # Use descriptive filename based on backup name and date
         # This preserves the "Automatic" or "Custom" prefix in the filename
         filename = suggested_filename(backup)
-        remote_path = f"{self._backup_folder}/{filename}"
+        remote_path = self._folder_prefix + filename
+        # Serialize the sidecar once, before any I/O; retried metadata uploads
+        # resend the same bytes
+        metadata_bytes = self._serialize_metadata(backup)
 
-        try:
-            # Get client once for reuse
-            client = await self._get_client()
+        # Get client once for reuse
+        client = await self._get_client()
 
-            # Ensure backup folder exists
+        if self._has_storage_headroom(backup.size):
+            # The backup fits with room to spare, even by the cached figures
             await self._ensure_backup_folder()
+        else:
+            # Ensure backup folder exists and fetch the free space
+            # concurrently; the two requests are independent. The results
+            # differ in type, so they are typed as Any
+            results: list[Any] = await _gather_all(
+                (self._ensure_backup_folder(), self._get_disk_info_cached())
+            )
+            disk_info: dict[str, Any] = results[1]
 
             # Check available space before upload
-            disk_info = await self._get_disk_info_cached()
             if disk_info["free_space"] < backup.size:
                 free_gb = disk_info["free_space"] / (1024**3)
                 needed_gb = backup.size / (1024**3)
@@ -257,61 +581,68 @@ class YandexDiskBackupAgent(BackupAgent):
                     f"Insufficient storage: {free_gb:.2f} GB free, {needed_gb:.2f} GB needed"
                 )
 
-            # Use client.upload() with async generator for streaming
-            # This provides:
-            # - Automatic User-Agent spoofing to bypass 128 KiB/s throttling
-            # - Built-in retry logic with exponential backoff
-            # - Streaming without loading entire file into memory
-            # See: https://yadisk.readthedocs.io/en/dev/known_issues.html
-            _LOGGER.debug(
-                "Starting upload for backup %s (expected size: %.2f MB)",
-                backup.name,
-                backup.size / (1024**2),
-            )
-
-            backup_file = await open_stream()
-
-            async def stream_generator() -> AsyncIterator[bytes]:
-                """Generator that yields chunks for streaming upload.
+        # Use client.upload() with async generator for streaming
+        # This provides:
+        # - Automatic User-Agent spoofing to bypass 128 KiB/s throttling
+        # - Built-in retry logic with exponential backoff
+        # - Streaming without loading entire file into memory
+        # See: https://yadisk.readthedocs.io/en/dev/known_issues.html
+        _LOGGER.debug(
+            "Starting upload for backup %s (expected size: %.2f MB)",
+            backup.name,
+            backup.size / (1024**2),
+        )
 
-                Yields:
-                    Chunks of backup data as they are read
-                """
-                total_bytes = 0
-                chunk_count = 0
-                async for chunk in backup_file:
-                    total_bytes += len(chunk)
-                    chunk_count += 1
-                    if chunk_count % 10 == 0:
-                        _LOGGER.debug(
-                            "Upload progress: %.2f MB sent (%d chunks)",
-                            total_bytes / (1024**2),
-                            chunk_count,
-                        )
-                    yield chunk
+        backup_file = await open_stream()
+
+        async def stream_generator() -> AsyncIterator[bytes]:
+            """Generator that yields chunks for streaming upload.
+
+            Small reads are coalesced into blocks of at least
+            UPLOAD_CHUNK_SIZE bytes to cut per-chunk overhead; reads that
+            are already large enough are passed through without copying.
+
+            Yields:
+                Blocks of backup data as they are read
+            """
+            total_bytes = 0
+            chunk_count = 0
+            buffer = bytearray()
+            loop = asyncio.get_running_loop()
+            last_log = loop.time()
+            async for chunk in backup_file:
+                if not buffer and len(chunk) >= UPLOAD_CHUNK_SIZE:
+                    block = chunk
+                else:
+                    buffer += chunk
+                    if len(buffer) < UPLOAD_CHUNK_SIZE:
+                        continue
+                    block = bytes(buffer)
+                    buffer.clear()
+                total_bytes += len(block)
+                chunk_count += 1
+                if (now := loop.time()) - last_log >= UPLOAD_PROGRESS_LOG_INTERVAL:
+                    last_log = now
+                    _LOGGER.debug(
+                        "Upload progress: %.2f MB sent (%d chunks)",
+                        total_bytes / (1024**2),
+                        chunk_count,
+                    )
+                yield block
 
-                _LOGGER.debug(
-                    "Finished reading stream: %.2f MB in %d chunks",
-                    total_bytes / (1024**2),
-                    chunk_count,
-                )
+            if buffer:
+                total_bytes += len(buffer)
+                chunk_count += 1
+                yield bytes(buffer)
 
-            _LOGGER.debug("Starting client.upload() with throttling bypass")
-            await client.upload(
-                stream_generator,
-                remote_path,
-                overwrite=True,
-                spoof_user_agent=True,  # Bypass 128 KiB/s throttling for .tar.gz
-                # Use longer timeout for large files (connect, read)
-                timeout=(30, 3600),
+            _LOGGER.debug(
+                "Finished reading stream: %.2f MB in %d chunks",
+                total_bytes / (1024**2),
+                chunk_count,
             )
 
-            _LOGGER.debug("client.upload() completed successfully")
-
-            # Upload metadata to sidecar file
-            await self._upload_metadata(client, remote_path, backup)
-
-            # Verify upload success
+        async def verify_upload() -> None:
+            """Check the uploaded file size against the backup metadata."""
             try:
                 meta = await client.get_meta(remote_path)
                 if meta.size != backup.size:
@@ -323,27 +654,39 @@ class YandexDiskBackupAgent(BackupAgent):
             except YaDiskError as err:
                 _LOGGER.error("Upload verification failed: %s", err)
 
-            _LOGGER.info(
-                "Uploaded backup %s (%.2f MB)",
-                backup.name,
-                backup.size / (1024**2),
+        _LOGGER.debug("Starting client.upload() with throttling bypass")
+        try:
+            await client.upload(
+                stream_generator,
+                remote_path,
+                overwrite=True,
+                spoof_user_agent=True,  # Bypass 128 KiB/s throttling for .tar.gz
+                # Use longer timeout for large files (connect, read)
+                timeout=(30, 3600),
             )
+            _LOGGER.debug("client.upload() completed successfully")
+            self._debit_disk_info_cache(backup.size)
+
+            # The sidecar only goes up once the backup is in place, so a
+            # failed or cancelled upload leaves no orphaned metadata behind.
+            # It and the size check only need the backup, so they overlap.
+            await _gather_all(
+                (
+                    self._upload_metadata(client, remote_path, metadata_bytes),
+                    verify_upload(),
+                )
+            )
+        finally:
+            # Even a failed upload may have left files behind
+            self._list_cache = None
+
+        _LOGGER.info(
+            "Uploaded backup %s (%.2f MB)",
+            backup.name,
+            backup.size / (1024**2),
+        )
 
-        except InsufficientStorageError as err:
-            _LOGGER.error("Yandex Disk storage full: %s", err)
-            raise BackupAgentError("Insufficient storage on Yandex Disk") from err
-        except YaDiskConnectionError as err:
-            _LOGGER.error("Connection error during upload: %s", err)
-            raise BackupAgentUnreachableError("Cannot connect to Yandex Disk") from err
-        except TooManyRequestsError as err:
-            _LOGGER.error("Rate limited during upload: %s", err)
-            raise BackupAgentUnreachableError(
-                "Too many requests. Please try again later"
-            ) from err
-        except YaDiskError as err:
-            _LOGGER.error("Upload failed: %s", err)
-            raise BackupAgentUnreachableError(str(err)) from err
-
+    @_map_yadisk_errors("delete")
     async def async_delete_backup(
         self,
         backup_id: str,
@@ -359,27 +702,23 @@ class YandexDiskBackupAgent(BackupAgent):
             BackupAgentError: If deletion fails
             BackupAgentUnreachableError: If Yandex Disk is unreachable
         """
-        remote_path = f"{self._backup_folder}/{backup_id}"
+        remote_path = self._folder_prefix + backup_id
         metadata_path = self._get_metadata_path(remote_path)
+        client = await self._get_client()
 
         try:
-            client = await self._get_client()
-            # Move to trash first (safer than permanent delete)
+            # Move to trash (safer than permanent delete)
             await client.remove(remote_path, permanently=False)
             _LOGGER.info("Deleted backup: %s", backup_id)
         except NotFoundError:
             # Already deleted - not an error
             _LOGGER.debug("Backup not found, may already be deleted: %s", backup_id)
-        except YaDiskConnectionError as err:
-            _LOGGER.error("Connection error during delete: %s", err)
-            raise BackupAgentUnreachableError("Cannot connect to Yandex Disk") from err
-        except YaDiskError as err:
-            _LOGGER.error("Delete failed: %s", err)
-            raise BackupAgentUnreachableError(str(err)) from err
+        finally:
+            self._list_cache = None
 
-        # Also try to delete the metadata sidecar file
+        # The sidecar is only removed once the backup is gone; a backup left
+        # behind by a failed removal keeps its metadata
         try:
-            client = await self._get_client()
             await client.remove(metadata_path, permanently=False)
             _LOGGER.debug("Deleted metadata file: %s", metadata_path)
         except NotFoundError:
@@ -391,6 +730,30 @@ class YandexDiskBackupAgent(BackupAgent):
             # Log warning but don't fail the delete operation
             _LOGGER.warning("Failed to delete metadata file: %s", err)
 
+    async def async_delete_backups(
+        self,
+        backup_ids: Iterable[str],
+        **kwargs: Any,
+    ) -> None:
+        """Delete several backups from Yandex Disk concurrently.
+
+        Used for retention cleanup, where deleting one backup after another
+        would pay every round trip in sequence.
+
+        Args:
+            backup_ids: The backup IDs to delete
+            **kwargs: Additional parameters passed to async_delete_backup
+
+        Raises:
+            BackupAgentError: If a deletion fails
+            BackupAgentUnreachableError: If Yandex Disk is unreachable
+        """
+        await _gather_limited(
+            DELETE_CONCURRENCY,
+            [self.async_delete_backup(backup_id, **kwargs) for backup_id in backup_ids],
+        )
+
+    @_map_yadisk_errors("list backups")
     async def async_list_backups(  # pylint: disable=too-many-locals
         self,
         **kwargs: Any,
@@ -408,104 +771,141 @@ class YandexDiskBackupAgent(BackupAgent):
             BackupAgentUnreachableError: If Yandex Disk is unreachable
         """
         try:
-            backups = []
+            backups: list[AgentBackup] = []
+            names: list[str] = []
             client = await self._get_client()
 
             _LOGGER.debug("Listing backups in folder: %s", self._backup_folder)
 
+            # Sidecar metadata is fetched over HA's pooled session, so the
+            # downloads reuse its keep-alive connections
+            session = async_get_clientsession(self.hass)
+            semaphore = asyncio.Semaphore(METADATA_FETCH_CONCURRENCY)
+
+            async def load_sidecar(name: str) -> dict[str, Any] | None:
+                """Load one backup's sidecar metadata, within the fetch limit."""
+                async with semaphore:
+                    return await self._load_metadata(
+                        session, client, self._folder_prefix + name
+                    )
+
             # listdir returns an async iterator
+            # Per-item debug logs are gated so their arguments are not built
+            # for every entry when debug logging is off
+            debug = _LOGGER.isEnabledFor(logging.DEBUG)
             item_count = 0
-            filtered_count = 0
-            async for item in client.listdir(self._backup_folder):  # type: ignore[attr-defined]
-                item_count += 1
-                _LOGGER.debug(
-                    "Found item #%d: type=%r, name=%r, resource_id=%s",
-                    item_count,
-                    getattr(item, "type", "unknown"),
-                    getattr(item, "name", None),
-                    getattr(item, "resource_id", None),
-                )
-
-                # Check all filter conditions with detailed logging
-                is_file = getattr(item, "type", None) == "file"
-                name = getattr(item, "name", None)
-                # Skip metadata files (they're processed with their backup files)
-                is_metadata_file = name is not None and name.endswith(".metadata.json")
-                is_backup = (
-                    name is not None
-                    and not is_metadata_file
-                    and self._is_backup_file(name)
-                )
+            sidecar_tasks: list[asyncio.Task[dict[str, Any] | None]] = []
+            try:
+                async for item in client.listdir(self._backup_folder):  # type: ignore[attr-defined]
+                    item_count += 1
+                    name = item.name
+                    if debug:
+                        _LOGGER.debug(
+                            "Found item #%d: type=%r, name=%r, resource_id=%s",
+                            item_count,
+                            item.type,
+                            name,
+                            item.resource_id,
+                        )
 
-                _LOGGER.debug(
-                    "Filter check for %r: is_file=%s, name=%s, is_backup=%s",
-                    name,
-                    is_file,
-                    name,
-                    is_backup,
-                )
+                    # Skip directories and non-backup files; metadata files are
+                    # processed together with their backup files
+                    if (
+                        item.type != "file"
+                        or name is None
+                        or name.endswith(".metadata.json")
+                        or not self._is_backup_file(name)
+                    ):
+                        continue
+
+                    names.append(name)
+                    # Start on the sidecar while listdir pages through the rest
+                    sidecar_tasks.append(asyncio.create_task(load_sidecar(name)))
+                    if debug:
+                        _LOGGER.debug(
+                            "Item %r passed filter, fetching metadata (%d/%d)",
+                            name,
+                            len(names),
+                            item_count,
+                        )
+            except BaseException:
+                for task in sidecar_tasks:
+                    task.cancel()
+                raise
 
-                if is_file and name is not None and is_backup:
-                    filtered_count += 1
-                    _LOGGER.debug(
-                        "Item %r passed filter, fetching metadata (%d/%d)",
-                        name,
-                        filtered_count,
-                        item_count,
-                    )
+            filtered_count = len(names)
 
-                    backup_path = f"{self._backup_folder}/{item.name}"
+            # Sidecar metadata takes precedence over file metadata
+            metadata_dicts = await _gather_all(sidecar_tasks)
 
-                    # Try to load metadata from sidecar file first
-                    metadata_dict = await self._load_metadata(client, backup_path)
+            # Fallback to file metadata for old backups without sidecar
+            missing = [
+                name
+                for name, metadata_dict in zip(names, metadata_dicts)
+                if not metadata_dict
+            ]
+            file_metas = dict(
+                zip(
+                    missing,
+                    await _gather_limited(
+                        METADATA_FETCH_CONCURRENCY,
+                        [
+                            client.get_meta(self._folder_prefix + name)
+                            for name in missing
+                        ],
+                    ),
+                )
+            )
 
-                    if metadata_dict:
-                        # Use metadata from sidecar file
-                        # IMPORTANT: Override backup_id to be the filename on disk
-                        # The original backup_id in metadata is HA's internal ID which
-                        # won't match our storage filename
-                        metadata_dict["backup_id"] = item.name
-                        backups.append(AgentBackup.from_dict(metadata_dict))
+            for name, metadata_dict in zip(names, metadata_dicts):
+                if metadata_dict:
+                    # Use metadata from sidecar file
+                    # IMPORTANT: Override backup_id to be the filename on disk
+                    # The original backup_id in metadata is HA's internal ID which
+                    # won't match our storage filename
+                    metadata_dict["backup_id"] = name
+                    backups.append(AgentBackup.from_dict(metadata_dict))
+                    if debug:
                         _LOGGER.debug(
                             "Loaded backup from metadata: %s (backup_id=%s)",
-                            metadata_dict.get("name", item.name),
-                            item.name,
-                        )
-                    else:
-                        # Fallback to file metadata for old backups without sidecar
-                        meta = await client.get_meta(backup_path)
-
-                        # Convert datetime to ISO format string
-                        date_str = (
-                            meta.created.isoformat()
-                            if isinstance(meta.created, datetime)
-                            else str(meta.created)
+                            metadata_dict.get("name", name),
+                            name,
                         )
+                    continue
+
+                meta = file_metas[name]
+                # yadisk types are optional; a file without a size can't be
+                # offered as a backup. Checked explicitly, unlike an assert,
+                # so it also holds under python -O
+                if meta.size is None:
+                    _LOGGER.warning("Skipping %s: Yandex Disk reported no size", name)
+                    continue
+
+                # Convert datetime to ISO format string
+                date_str = (
+                    meta.created.isoformat()
+                    if isinstance(meta.created, datetime)
+                    else str(meta.created)
+                )
 
-                        # yadisk types can be None, but for files they should always be present
-                        assert meta.size is not None
-                        # Use item.name instead of meta.name for consistency
-                        # Both item.name and meta.name can be None in yadisk types,
-                        # but for files they should always have a name
-                        assert item.name is not None
-                        file_name = item.name if meta.name is None else meta.name
-                        assert file_name is not None
-
-                        backups.append(
-                            AgentBackup(
-                                backup_id=item.name,
-                                name=file_name,
-                                size=meta.size,
-                                date=date_str,
-                                addons=[],
-                                database_included=False,
-                                extra_metadata={},
-                                folders=[],
-                                homeassistant_included=True,
-                                homeassistant_version=None,
-                                protected=False,
-                            )
-                        )
+                # meta.name can be None in yadisk types; fall back to the item name
+                file_name = meta.name or name
+
+                backups.append(
+                    AgentBackup(
+                        backup_id=name,
+                        name=file_name,
+                        size=meta.size,
+                        date=date_str,
+                        addons=[],
+                        database_included=False,
+                        extra_metadata={},
+                        folders=[],
+                        homeassistant_included=True,
+                        homeassistant_version=None,
+                        protected=False,
+                    )
+                )
 
             _LOGGER.debug(
                 "List complete: %d total items, %d passed filter, %d backups added",
@@ -514,8 +914,12 @@ class YandexDiskBackupAgent(BackupAgent):
                 len(backups),
             )
 
-            # Sort by date, newest first
-            backups.sort(key=lambda b: b.date, reverse=True)
+            # Sort by date (ISO-8601 strings sort chronologically), newest first
+            backups.sort(key=attrgetter("date"), reverse=True)
+            self._list_cache = (
+                {backup.backup_id: backup for backup in backups},
+                monotonic(),
+            )
             _LOGGER.debug("Listed %d backups", len(backups))
             return backups
 
@@ -524,13 +928,8 @@ class YandexDiskBackupAgent(BackupAgent):
             _LOGGER.info("Backup folder not found, creating: %s", self._backup_folder)
             await self._ensure_backup_folder()
             return []
-        except YaDiskConnectionError as err:
-            _LOGGER.error("Connection error during list: %s", err)
-            raise BackupAgentUnreachableError("Cannot connect to Yandex Disk") from err
-        except YaDiskError as err:
-            _LOGGER.error("List backups failed: %s", err)
-            raise BackupAgentUnreachableError(str(err)) from err
 
+    @_map_yadisk_errors("get backup")
     async def async_get_backup(
         self,
         backup_id: str,
@@ -549,13 +948,22 @@ class YandexDiskBackupAgent(BackupAgent):
             BackupAgentError: If backup not found or get fails
             BackupAgentUnreachableError: If Yandex Disk is unreachable
         """
-        remote_path = f"{self._backup_folder}/{backup_id}"
+        # A lookup right after a listing, as when a backup is picked from
+        # the list, is answered from that listing
+        if self._list_cache is not None:
+            listed, list_time = self._list_cache
+            if monotonic() - list_time < LIST_CACHE_TTL and backup_id in listed:
+                return listed[backup_id]
+
+        remote_path = self._folder_prefix + backup_id
 
         try:
             client = await self._get_client()
 
             # Try to load metadata from sidecar file first
-            metadata_dict = await self._load_metadata(client, remote_path)
+            metadata_dict = await self._load_metadata(
+                async_get_clientsession(self.hass), client, remote_path
+            )
 
             if metadata_dict:
                 # Use metadata from sidecar file
@@ -567,6 +975,10 @@ class YandexDiskBackupAgent(BackupAgent):
 
             # Fallback to file metadata for old backups without sidecar
             meta = await client.get_meta(remote_path)
+            # yadisk types are optional; checked explicitly so that it also
+            # holds under python -O
+            if meta.size is None:
+                raise BackupAgentError(f"Backup {backup_id} has no size")
 
             # Convert datetime to ISO format string
             date_str = (
@@ -575,9 +987,7 @@ class YandexDiskBackupAgent(BackupAgent):
                 else str(meta.created)
             )
 
-            # yadisk types can be None, but for files they should always be present
-            assert meta.size is not None
-            file_name = backup_id if meta.name is None else meta.name
+            file_name = meta.name or backup_id
 
             return AgentBackup(
                 backup_id=backup_id,
@@ -595,12 +1005,6 @@ class YandexDiskBackupAgent(BackupAgent):
 
         except NotFoundError as err:
             raise BackupAgentError(f"Backup {backup_id} not found") from err
-        except YaDiskConnectionError as err:
-            _LOGGER.error("Connection error during get: %s", err)
-            raise BackupAgentUnreachableError("Cannot connect to Yandex Disk") from err
-        except YaDiskError as err:
-            _LOGGER.error("Get backup failed: %s", err)
-            raise BackupAgentUnreachableError(str(err)) from err
 
     @staticmethod
     def _get_metadata_path(backup_path: str) -> str:
@@ -613,27 +1017,38 @@ class YandexDiskBackupAgent(BackupAgent):
             The path to the metadata file
         """
         # Remove .tar extension if present and add .metadata.json
-        if backup_path.endswith(".tar"):
-            return backup_path[:-4] + ".metadata.json"
-        return backup_path + ".metadata.json"
+        return backup_path.removesuffix(".tar") + ".metadata.json"
+
+    @staticmethod
+    def _serialize_metadata(backup: AgentBackup) -> bytes:
+        """Serialize backup metadata for its sidecar file.
+
+        Args:
+            backup: The AgentBackup metadata
+
+        Returns:
+            The UTF-8 encoded JSON document
+        """
+        # orjson encodes straight to UTF-8 bytes; the indent keeps the
+        # sidecar readable when browsed on Yandex Disk
+        # orjson is a C extension that pylint cannot introspect
+        # pylint: disable-next=no-member
+        return orjson.dumps(backup.as_dict(), option=orjson.OPT_INDENT_2)
 
     async def _upload_metadata(
         self,
         client: AsyncClient,
         backup_path: str,
-        backup: AgentBackup,
+        metadata_bytes: bytes,
     ) -> None:
         """Upload backup metadata to a sidecar file.
 
         Args:
             client: The yadisk async client
             backup_path: The path to the backup file
-            backup: The AgentBackup metadata
+            metadata_bytes: The serialized metadata (see _serialize_metadata)
         """
         metadata_path = self._get_metadata_path(backup_path)
-        metadata_dict = backup.as_dict()
-        metadata_json = json.dumps(metadata_dict, ensure_ascii=False, indent=2)
-        metadata_bytes = metadata_json.encode("utf-8")
 
         async def metadata_generator() -> AsyncIterator[bytes]:
             """Generator for metadata upload."""
@@ -649,12 +1064,14 @@ class YandexDiskBackupAgent(BackupAgent):
 
     async def _load_metadata(
         self,
+        session: ClientSession,
         client: AsyncClient,
         backup_path: str,
     ) -> dict[str, Any] | None:
         """Load backup metadata from sidecar file.
 
         Args:
+            session: The aiohttp client session to download with
             client: The yadisk async client
             backup_path: The path to the backup file
 
@@ -664,11 +1081,13 @@ class YandexDiskBackupAgent(BackupAgent):
         metadata_path = self._get_metadata_path(backup_path)
         try:
             download_url = await client.get_download_link(metadata_path)
-            session = async_get_clientsession(self.hass)
             async with session.get(download_url) as response:
                 response.raise_for_status()
-                content = await response.text()
-                return json.loads(content)
+                # Parse the raw bytes with orjson; skips decoding to str first
+                return json_loads_object(await response.read())
+        except ValueError as err:
+            _LOGGER.warning("Invalid metadata file %s: %s", metadata_path, err)
+            return None
         except NotFoundError:
             _LOGGER.debug("No metadata file found at %s", metadata_path)
             return None
@@ -695,6 +1114,57 @@ class YandexDiskBackupAgent(BackupAgent):
                 _LOGGER.error("Failed to create backup folder: %s", err)
                 raise BackupAgentError("Cannot create backup folder") from err
 
+    def _get_fresh_disk_info(self) -> dict[str, Any] | None:
+        """Return cached disk info if it is younger than DISK_INFO_CACHE_TTL.
+
+        Returns:
+            The cached disk info dict, or None if missing or expired
+        """
+        # Monotonic timestamps, so wall-clock jumps don't affect the TTL
+        if self._disk_info_cache:
+            cached_data, cache_time = self._disk_info_cache
+            if monotonic() - cache_time < DISK_INFO_CACHE_TTL:
+                return cached_data
+        return None
+
+    def _has_storage_headroom(self, size: int) -> bool:
+        """Check whether cached disk info leaves ample space for an upload.
+
+        Only disk info within DISK_INFO_CACHE_TTL is trusted: uploads are
+        debited from it (see _debit_disk_info_cache), but the disk is shared
+        with other content, so older figures may overstate the free space.
+
+        Args:
+            size: Size of the upload in bytes
+
+        Returns:
+            True if the free space left after the upload exceeds
+            DISK_HEADROOM_PERCENT of the disk, False if unknown or tighter
+        """
+        if (cached_data := self._get_fresh_disk_info()) is None:
+            return False
+        headroom = cached_data["total_space"] * DISK_HEADROOM_PERCENT // 100
+        return cached_data["free_space"] - size > headroom
+
+    def _debit_disk_info_cache(self, size: int) -> None:
+        """Account for an upload in the cached disk info, keeping its age.
+
+        Args:
+            size: Size of the uploaded file in bytes
+        """
+        if self._disk_info_cache is None:
+            return
+        cached_data, cache_time = self._disk_info_cache
+        self._disk_info_cache = (
+            {
+                "total_space": cached_data["total_space"],
+                "used_space": cached_data["used_space"] + size,
+                "free_space": cached_data["free_space"] - size,
+            },
+            cache_time,
+        )
+
+    @_map_yadisk_errors("get disk info")
     async def _get_disk_info_cached(self) -> dict[str, Any]:
         """Get disk info with caching to reduce API calls.
 
@@ -704,39 +1174,28 @@ class YandexDiskBackupAgent(BackupAgent):
         Raises:
             BackupAgentUnreachableError: If API call fails
         """
+        # Fast path: a fresh cache entry can be read without taking the lock
+        if (cached_data := self._get_fresh_disk_info()) is not None:
+            return cached_data
+
         async with self._cache_lock:
-            # Cache for 5 minutes
-            if self._disk_info_cache:
-                cached_data, cache_time = self._disk_info_cache
-                if (datetime.now() - cache_time).total_seconds() < 300:
-                    return cached_data
+            # Another task may have refreshed the cache while we waited
+            if (cached_data := self._get_fresh_disk_info()) is not None:
+                return cached_data
 
             # Fetch fresh data
-            try:
-                client = await self._get_client()
-                disk_info = await client.get_disk_info()
-                # Handle potential None values from yadisk
-                total_space = disk_info.total_space or 0
-                used_space = disk_info.used_space or 0
-                data = {
-                    "total_space": total_space,
-                    "used_space": used_space,
-                    "free_space": total_space - used_space,
-                }
-                self._disk_info_cache = (data, datetime.now())
-                return data
-            except YaDiskConnectionError as err:
-                _LOGGER.error("Connection error getting disk info: %s", err)
-                raise BackupAgentUnreachableError(
-                    "Cannot connect to Yandex Disk"
-                ) from err
-            except YaDiskError as err:
-                _LOGGER.error("Failed to get disk info: %s", err)
-                raise BackupAgentUnreachableError(str(err)) from err
-
-    # Pattern for Home Assistant backup IDs (hexadecimal hash)
-    # Home Assistant uses 8-64 character hexadecimal strings as backup IDs
-    _BACKUP_ID_PATTERN = re.compile(r"^[a-f0-9]{8,64}$")
+            client = await self._get_client()
+            disk_info = await client.get_disk_info()
+            # Handle potential None values from yadisk
+            total_space = disk_info.total_space or 0
+            used_space = disk_info.used_space or 0
+            data = {
+                "total_space": total_space,
+                "used_space": used_space,
+                "free_space": total_space - used_space,
+            }
+            self._disk_info_cache = (data, monotonic())
+            return data
 
     @staticmethod
     def _is_backup_file(filename: str) -> bool:
@@ -748,20 +1207,27 @@ class YandexDiskBackupAgent(BackupAgent):
         Returns:
             True if filename is a backup file (ends with .tar/.tar.gz or is a hash-style ID)
         """
-        # Check for traditional extensions
-        if filename.endswith((".tar", ".tar.gz")):
-            return True
-
-        # Check for Home Assistant hash-style backup IDs (hexadecimal strings)
-        # These are typically 8-64 characters long and consist of lowercase hex digits
-        return bool(YandexDiskBackupAgent._BACKUP_ID_PATTERN.match(filename))
+        return _is_backup_file_name(filename)
 
     async def async_close(self) -> None:
-        """Close the yadisk client session.
+        """Release the yadisk client and close the shared session if unused.
 
-        This should be called when unloading the integration.
+        This should be called when unloading the integration. Calling it
+        more than once is safe.
         """
-        if self._client is not None:
-            await self._client.close()
-            self._client = None
-            _LOGGER.debug("Closed Yandex Disk client")
+        # Detach first so concurrent or repeated calls are no-ops
+        client, self._client = self._client, None
+        if client is None:
+            return
+
+        # The HTTP session is shared; only close it when its last user is done
+        shared: _SharedYaDiskSession | None = self.hass.data.get(DATA_YADISK_SESSION)
+        if shared is not None and shared.session is client.session:
+            shared.users -= 1
+            if shared.users > 0:
+                _LOGGER.debug("Released Yandex Disk client")
+                return
+            del self.hass.data[DATA_YADISK_SESSION]
+
+        await client.close()
+        _LOGGER.debug("Closed Yandex Disk client")
@@ -1,6 +1,8 @@
 """Config flow for Yandex Disk backup integration."""
 
 from collections.abc import Mapping
+from hashlib import blake2b
+from time import monotonic
 from typing import Any, Self
 import voluptuous as vol  # type: ignore[import-untyped]
 from yadisk import AsyncClient
@@ -11,25 +13,52 @@ from homeassistant.config_entries import ConfigFlowResult
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import config_validation as cv
 
+from .backup import async_create_yadisk_session
 from .const import (
     CONF_BACKUP_FOLDER,
     CONF_TOKEN,
     DEFAULT_BACKUP_FOLDER,
     DOMAIN,
+    TOKEN_UNIQUE_ID_LENGTH,
+    TOKEN_VALIDATION_CACHE_TTL,
     _LOGGER,
 )
 
+# Compiled once at import; voluptuous builds its validator tree in the
+# constructor, so every flow step reuses this object as-is
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
-        vol.Required(CONF_TOKEN): str,
+        vol.Required(CONF_TOKEN): vol.All(
+            cv.string, vol.Length(min=TOKEN_UNIQUE_ID_LENGTH)
+        ),
         vol.Optional(CONF_BACKUP_FOLDER, default=DEFAULT_BACKUP_FOLDER): cv.string,
-    }
+    },
+    extra=vol.PREVENT_EXTRA,
 )
 
+# Recent validation results: token digest -> (time.monotonic() timestamp, valid).
+# Keyed by a digest so raw tokens are not kept around in memory.
+_TOKEN_VALIDATION_CACHE: dict[str, tuple[float, bool]] = {}
 
-async def _async_validate_token(  # pylint: disable=unused-argument
-    hass: HomeAssistant, token: str
-) -> bool:
+
+def _cache_token_validation(key: str, valid: bool) -> None:
+    """Store a token validation result, dropping expired ones.
+
+    Args:
+        key: Digest of the validated token
+        valid: Whether the token was accepted
+    """
+    now = monotonic()
+    for expired in [
+        cached_key
+        for cached_key, (validated_at, _) in _TOKEN_VALIDATION_CACHE.items()
+        if now - validated_at >= TOKEN_VALIDATION_CACHE_TTL
+    ]:
+        del _TOKEN_VALIDATION_CACHE[expired]
+    _TOKEN_VALIDATION_CACHE[key] = (now, valid)
+
+
+async def _async_validate_token(hass: HomeAssistant, token: str) -> bool:
     """Validate OAuth token by checking Yandex Disk access.
 
     Args:
@@ -38,39 +67,43 @@ async def _async_validate_token(  # pylint: disable=unused-argument
 
     Returns:
         True if token is valid, False otherwise
-    """
-
-    def _create_client() -> AsyncClient:
-        """Create AsyncClient - may block on SSL context initialization.
 
-        Returns:
-            The created AsyncClient instance
-        """
-        return AsyncClient(token=token)
+    Unexpected (non-yadisk) errors propagate so the flow fails visibly
+    instead of reporting an invalid token.
+    """
+    # Definitive answers are reused for TOKEN_VALIDATION_CACHE_TTL so that
+    # back-to-back submits in one flow don't repeat the round trip
+    key = blake2b(token.encode(), digest_size=16).hexdigest()
+    if (cached := _TOKEN_VALIDATION_CACHE.get(key)) is not None:
+        validated_at, valid = cached
+        if monotonic() - validated_at < TOKEN_VALIDATION_CACHE_TTL:
+            return valid
 
     try:
-        # Run client creation in executor to avoid blocking SSL calls
-        client = await hass.async_add_executor_job(_create_client)
-        async with client as client_ctx:
+        session = async_create_yadisk_session(hass)
+        async with AsyncClient(token=token, session=session) as client_ctx:
             # Try to get disk info to validate token
             await client_ctx.get_disk_info()
-            return True
-    except UnauthorizedError:
-        _LOGGER.error("Invalid Yandex Disk token")
-        return False
     except YaDiskError as err:
-        _LOGGER.error("Token validation error: %s", err)
-        return False
-    except Exception:  # pylint: disable=broad-exception-caught
-        _LOGGER.exception("Unexpected error validating token")
+        if isinstance(err, UnauthorizedError):
+            _LOGGER.error("Invalid Yandex Disk token")
+            _cache_token_validation(key, False)
+        else:
+            # Transient errors are not cached; a retry should hit the API again
+            _LOGGER.error("Token validation error: %s", err)
         return False
 
+    _cache_token_validation(key, True)
+    return True
+
 
 class YandexDiskConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ignore[call-arg]
     """Yandex Disk config flow."""
 
     VERSION = 1
 
+    _schema = STEP_USER_DATA_SCHEMA
+
     def is_matching(self, other_flow: Self) -> bool:  # pylint: disable=unused-argument
         """Check if another flow matches this flow.
 
@@ -84,6 +117,24 @@ class YandexDiskConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: i
         # which is handled by Home Assistant's base class logic
         return False
 
+    async def _async_handle_token_submission(
+        self, user_input: Mapping[str, Any]
+    ) -> tuple[dict[str, str], bool]:
+        """Validate a submitted token and claim its unique_id.
+
+        Args:
+            user_input: User input containing the token
+
+        Returns:
+            Form errors and whether the token was accepted
+        """
+        if not await _async_validate_token(self.hass, user_input[CONF_TOKEN]):
+            return {"base": "invalid_token"}, False
+
+        # Use the token prefix as unique_id
+        await self.async_set_unique_id(user_input[CONF_TOKEN][:TOKEN_UNIQUE_ID_LENGTH])
+        return {}, True
+
     async def async_step_user(
         self,
         user_input: dict[str, str] | None = None,
@@ -96,26 +147,15 @@ class YandexDiskConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: i
         Returns:
             Config flow result (form, create_entry, or abort)
         """
-        errors = {}
+        errors: dict[str, str] = {}
 
         if user_input is not None:
-            # Validate token
-            token_valid = await _async_validate_token(
-                self.hass,
-                user_input[CONF_TOKEN],
-            )
-
-            if not token_valid:
-                errors["base"] = "invalid_token"
-            else:
-                # Use first 8 chars of token as unique_id
-                await self.async_set_unique_id(user_input[CONF_TOKEN][:8])
+            errors, token_valid = await self._async_handle_token_submission(user_input)
+            if token_valid:
                 self._abort_if_unique_id_configured()
 
                 # Ensure backup_folder has a value (use default if not provided)
-                if CONF_BACKUP_FOLDER not in user_input:
-                    user_input = dict(user_input)
-                    user_input[CONF_BACKUP_FOLDER] = DEFAULT_BACKUP_FOLDER
+                user_input.setdefault(CONF_BACKUP_FOLDER, DEFAULT_BACKUP_FOLDER)
 
                 # Create config entry
                 return self.async_create_entry(
@@ -125,7 +165,7 @@ class YandexDiskConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: i
 
         return self.async_show_form(
             step_id="user",
-            data_schema=STEP_USER_DATA_SCHEMA,
+            data_schema=self._schema,
             errors=errors,
         )
 
@@ -153,23 +193,15 @@ class YandexDiskConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: i
         Returns:
             Config flow result (abort if successful, form if validation fails)
         """
-        errors = {}
+        errors: dict[str, str] = {}
 
         if user_input is not None:
-            # Validate the new token
-            token_valid = await _async_validate_token(
-                self.hass,
-                user_input[CONF_TOKEN],
-            )
-
-            if not token_valid:
-                errors["base"] = "invalid_token"
-            else:
-                await self.async_set_unique_id(user_input[CONF_TOKEN][:8])
+            errors, token_valid = await self._async_handle_token_submission(user_input)
+            if token_valid:
                 return self.async_abort(reason="reauth_successful")
 
         return self.async_show_form(
             step_id="reauth_confirm",
-            data_schema=STEP_USER_DATA_SCHEMA,
+            data_schema=self._schema,
             errors=errors,
         )
@@ -8,6 +8,10 @@ DOMAIN = "yandex_disk_backup"
 CONF_TOKEN = "token"
 CONF_BACKUP_FOLDER = "backup_folder"
 
+# Number of leading token characters used as the config entry unique_id;
+# shorter tokens are rejected by the config flow schema
+TOKEN_UNIQUE_ID_LENGTH = 8
+
 # Defaults
 DEFAULT_BACKUP_FOLDER = "/Home Assistant Backups"
 
@@ -17,9 +21,44 @@ DOWNLOAD_TIMEOUT = 300
 LIST_TIMEOUT = 30
 DELETE_TIMEOUT = 30
 
+# How long cached disk info (free/used space) stays valid
+DISK_INFO_CACHE_TTL = 300.0
+
+# How long a backup listing is reused to answer single backup lookups
+LIST_CACHE_TTL = 5.0
+
+# Uploads skip the free space check when the last known free space, minus the
+# backup, still exceeds this percentage of the disk
+DISK_HEADROOM_PERCENT = 10
+
+# How long a token validation result is reused by the config flow
+TOKEN_VALIDATION_CACHE_TTL = 60.0
+
+# Minimum interval between upload progress debug messages (in seconds)
+UPLOAD_PROGRESS_LOG_INTERVAL = 5.0
+
 # Chunk size for streaming downloads (4 MB to match HA backup patterns)
 CHUNK_SIZE = 4 * 1024 * 1024
 
+# Minimum size of each block handed to the uploader; small reads from the
+# backup stream are coalesced so every HTTP write moves at least this much
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Parallel ranged downloads: number of concurrent HTTP Range requests and the
+# size of each requested segment (bounds memory to connections * segment size)
+DOWNLOAD_CONNECTIONS = 4
+DOWNLOAD_SEGMENT_SIZE = 2 * CHUNK_SIZE
+
+# Retries per failed download segment, with a linear backoff (in seconds)
+DOWNLOAD_SEGMENT_RETRIES = 3
+DOWNLOAD_RETRY_INTERVAL = 1.0
+
+# Maximum concurrent metadata requests while listing backups
+METADATA_FETCH_CONCURRENCY = 8
+
+# Maximum concurrent backup deletions when deleting several backups at once
+DELETE_CONCURRENCY = 8
+
 # Backup file extensions
 BACKUP_EXTENSIONS = (".tar", ".tar.gz")
 
@@ -27,7 +66,10 @@ BACKUP_EXTENSIONS = (".tar", ".tar.gz")
 _LOGGER = getLogger(__name__)
 
 # Data to redact from diagnostics
-TO_REDACT = {CONF_TOKEN, "access_token", "refresh_token"}
+TO_REDACT: frozenset[str] = frozenset({CONF_TOKEN, "access_token", "refresh_token"})
 
 # Backup agent listeners key in hass.data
 DATA_BACKUP_AGENT_LISTENERS = "backup_agent_listeners"
+
+# Shared yadisk HTTP session key in hass.data
+DATA_YADISK_SESSION = f"{DOMAIN}_yadisk_session"
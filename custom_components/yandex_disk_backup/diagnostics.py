@@ -1,13 +1,17 @@
 """Diagnostics support for Yandex Disk backup integration."""
 
+import asyncio
 from typing import Any
 
+from homeassistant.components.backup import AgentBackup  # type: ignore[attr-defined]
 from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN, TO_REDACT
 
+_GIB = 1 << 30
+
 
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant,
@@ -31,32 +35,36 @@ async def async_get_config_entry_diagnostics(
     }
 
     if agent:
-        try:
-            # Get storage information
-            disk_info = await agent._get_disk_info_cached()
+        # Storage info and the backup listing are independent API calls
+        disk_info: dict[str, Any] | BaseException
+        backups: list[AgentBackup] | BaseException
+        disk_info, backups = await asyncio.gather(
+            agent._get_disk_info_cached(),
+            agent.async_list_backups(),
+            return_exceptions=True,
+        )
+        # Cancellation and other non-errors are not diagnostics results
+        for result in (disk_info, backups):
+            if isinstance(result, BaseException) and not isinstance(result, Exception):
+                raise result
+
+        if isinstance(disk_info, BaseException):
+            diagnostics["storage_info"] = {"error": "Failed to get storage info"}
+        else:
+            total = disk_info["total_space"]
+            used = disk_info["used_space"]
             diagnostics["storage_info"] = {
-                "total_space_gb": round(disk_info["total_space"] / (1024**3), 2),
-                "used_space_gb": round(disk_info["used_space"] / (1024**3), 2),
-                "free_space_gb": round(disk_info["free_space"] / (1024**3), 2),
-                "used_percentage": (
-                    round(
-                        disk_info["used_space"] / disk_info["total_space"] * 100,
-                        1,
-                    )
-                    if disk_info["total_space"] > 0
-                    else 0
-                ),
+                "total_space_gb": round(total / _GIB, 2),
+                "used_space_gb": round(used / _GIB, 2),
+                "free_space_gb": round(disk_info["free_space"] / _GIB, 2),
+                "used_percentage": round(used * 100.0 / total, 1) if total > 0 else 0,
             }
-        except Exception:  # pylint: disable=broad-exception-caught
-            diagnostics["storage_info"] = {"error": "Failed to get storage info"}
 
-        try:
-            # Get backup count
-            backups = await agent.async_list_backups()
+        if isinstance(backups, BaseException):
+            diagnostics["backup_count"] = {"error": "Failed to list backups"}
+        else:
             diagnostics["backup_count"] = len(backups)
             if backups:
                 diagnostics["last_backup"] = backups[0].date
-        except Exception:  # pylint: disable=broad-exception-caught
-            diagnostics["backup_count"] = {"error": "Failed to list backups"}
 
     return diagnostics
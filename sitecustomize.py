@@ -7,10 +7,15 @@ or any other modules are imported.
 import sys
 import types
 
-# On Windows, mock Unix-only modules before anything else imports them
-if sys.platform == "win32":
+
+def _install_unix_mocks():
+    """Mock Unix-only modules, skipping the work if already installed."""
+    if getattr(sys.modules.get("fcntl"), "_ydb_mock", False):
+        return
+
     # Mock fcntl module (Unix file control)
     fcntl_mock = types.ModuleType("fcntl")
+    fcntl_mock._ydb_mock = True
     fcntl_mock.fcntl = lambda *args, **kwargs: 0
     fcntl_mock.F_GETFL = 0
     fcntl_mock.F_SETFL = 0
@@ -19,7 +24,13 @@ if sys.platform == "win32":
 
     # Mock resource module (Unix resource limits)
     resource_mock = types.ModuleType("resource")
+    resource_mock._ydb_mock = True
     resource_mock.getrlimit = lambda *args: (0, 0)
     resource_mock.setrlimit = lambda *args, **kwargs: None
     resource_mock.RLIMIT_NOFILE = 0
     sys.modules["resource"] = resource_mock
+
+
+# On Windows, mock Unix-only modules before anything else imports them
+if sys.platform == "win32":
+    _install_unix_mocks()
@@ -7,13 +7,17 @@ global configurations that apply to all tests.
 import sys
 import asyncio
 
-# On Windows, set up the event loop policy and mock Unix-only modules
-if sys.platform == "win32":
-    # Mock Unix-only modules before importing homeassistant.runner
+
+def _install_unix_mocks():
+    """Mock Unix-only modules unless sitecustomize.py already did."""
+    if getattr(sys.modules.get("fcntl"), "_ydb_mock", False):
+        return
+
     import types
 
     # Mock fcntl module
     fcntl_mock = types.ModuleType("fcntl")
+    fcntl_mock._ydb_mock = True
     fcntl_mock.fcntl = lambda *args, **kwargs: 0
     fcntl_mock.F_GETFL = 0
     fcntl_mock.F_SETFL = 0
@@ -22,7 +26,13 @@ if sys.platform == "win32":
 
     # Mock resource module
     resource_mock = types.ModuleType("resource")
+    resource_mock._ydb_mock = True
     resource_mock.getrlimit = lambda *args: (0, 0)
     resource_mock.setrlimit = lambda *args, **kwargs: None
     resource_mock.RLIMIT_NOFILE = 0
     sys.modules["resource"] = resource_mock
+
+
+# On Windows, mock Unix-only modules before importing homeassistant.runner
+if sys.platform == "win32":
+    _install_unix_mocks()
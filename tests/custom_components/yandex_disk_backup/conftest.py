@@ -7,19 +7,22 @@ import sys
 from pathlib import Path
 from unittest.mock import AsyncMock, Mock, patch
 
-# Windows-specific fix for pytest-socket compatibility
-# Use SelectorEventLoopPolicy on Windows to avoid ProactorEventLoop socket issues
-if sys.platform == "win32":
-    from asyncio import WindowsSelectorEventLoopPolicy
-    asyncio.set_event_loop_policy(WindowsSelectorEventLoopPolicy())
 
-
-# Pytest hook to ensure WindowsSelectorEventLoopPolicy is set before event_loop fixture
+# Windows-specific fix for pytest-socket compatibility: use
+# SelectorEventLoopPolicy to avoid ProactorEventLoop socket issues. Set from
+# the hook so it is in place before the event_loop fixture runs.
 def pytest_configure(config):
     """Configure pytest to use WindowsSelectorEventLoopPolicy on Windows."""
-    if sys.platform == "win32":
-        from asyncio import WindowsSelectorEventLoopPolicy
-        asyncio.set_event_loop_policy(WindowsSelectorEventLoopPolicy())
+    if sys.platform != "win32":
+        return
+    if (
+        asyncio.get_event_loop_policy().__class__.__name__
+        == "WindowsSelectorEventLoopPolicy"
+    ):
+        return
+    from asyncio import WindowsSelectorEventLoopPolicy
+    asyncio.set_event_loop_policy(WindowsSelectorEventLoopPolicy())
+
 
 # Remove test directory from sys.path to prevent namespace conflicts
 test_dir = Path(__file__).parent
@@ -31,7 +34,7 @@ import yadisk
 # Now we can safely load our local custom_components.yandex_disk_backup modules
 import importlib.util
 
-project_root = Path(__file__).parent.parent.parent.parent
+COMPONENT_DIR = Path(__file__).resolve().parents[3] / "custom_components" / "yandex_disk_backup"
 
 # We need to create the parent module first for relative imports to work
 if "custom_components.yandex_disk_backup" not in sys.modules:
@@ -39,43 +42,38 @@ if "custom_components.yandex_disk_backup" not in sys.modules:
     parent_module = type(sys)("custom_components.yandex_disk_backup")
     sys.modules["custom_components.yandex_disk_backup"] = parent_module
 
-# Load const.py first (no dependencies)
-const_path = project_root / "custom_components" / "yandex_disk_backup" / "const.py"
-if const_path.exists() and "custom_components.yandex_disk_backup.const" not in sys.modules:
-    spec = importlib.util.spec_from_file_location(
-        "custom_components.yandex_disk_backup.const", const_path
-    )
-    module = importlib.util.module_from_spec(spec)
-    sys.modules["custom_components.yandex_disk_backup.const"] = module
-    spec.loader.exec_module(module)
-    # Also set it as an attribute of the parent module
-    setattr(sys.modules["custom_components.yandex_disk_backup"], "const", module)
+# Load the integration modules in dependency order (const has no dependencies,
+# backup imports from const, config_flow from both)
+_MODS = ("const", "backup", "config_flow")
 
-# Load backup.py (depends on const)
-backup_path = project_root / "custom_components" / "yandex_disk_backup" / "backup.py"
-if backup_path.exists() and "custom_components.yandex_disk_backup.backup" not in sys.modules:
+for _name in _MODS:
+    _full_name = f"custom_components.yandex_disk_backup.{_name}"
+    if _full_name in sys.modules:
+        continue
     spec = importlib.util.spec_from_file_location(
-        "custom_components.yandex_disk_backup.backup", backup_path
+        _full_name, COMPONENT_DIR / f"{_name}.py"
     )
     module = importlib.util.module_from_spec(spec)
-    sys.modules["custom_components.yandex_disk_backup.backup"] = module
+    sys.modules[_full_name] = module
     spec.loader.exec_module(module)
     # Also set it as an attribute of the parent module
-    setattr(sys.modules["custom_components.yandex_disk_backup"], "backup", module)
-
-# Load config_flow.py (depends on const)
-config_flow_path = project_root / "custom_components" / "yandex_disk_backup" / "config_flow.py"
-if config_flow_path.exists() and "custom_components.yandex_disk_backup.config_flow" not in sys.modules:
-    spec = importlib.util.spec_from_file_location(
-        "custom_components.yandex_disk_backup.config_flow", config_flow_path
+    setattr(sys.modules["custom_components.yandex_disk_backup"], _name, module)
+
+# Run the package __init__ in the parent module once its submodules are
+# loaded, so its relative imports resolve to them
+_package = sys.modules["custom_components.yandex_disk_backup"]
+if not hasattr(_package, "async_setup_entry"):
+    _package.__package__ = "custom_components.yandex_disk_backup"
+    _package.__path__ = [str(COMPONENT_DIR)]
+    _init_spec = importlib.util.spec_from_file_location(
+        "custom_components.yandex_disk_backup", COMPONENT_DIR / "__init__.py"
     )
-    module = importlib.util.module_from_spec(spec)
-    sys.modules["custom_components.yandex_disk_backup.config_flow"] = module
-    spec.loader.exec_module(module)
-    # Also set it as an attribute of the parent module
-    setattr(sys.modules["custom_components.yandex_disk_backup"], "config_flow", module)
+    _init_spec.loader.exec_module(_package)
 
+from dataclasses import dataclass
 from datetime import datetime
+from types import SimpleNamespace
+from typing import Any
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
@@ -84,6 +82,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_registry import EntityRegistry
 
+from custom_components.yandex_disk_backup import config_flow
 from custom_components.yandex_disk_backup.backup import YandexDiskBackupAgent
 from custom_components.yandex_disk_backup.const import (
     CONF_BACKUP_FOLDER,
@@ -92,18 +91,24 @@ from custom_components.yandex_disk_backup.const import (
 )
 
 
-@pytest.fixture
+class _FakeHass:
+    """Minimal stand-in for HomeAssistant exposing only what the tests use."""
+
+    __slots__ = ("data", "config", "bus", "config_entries", "async_add_executor_job")
+
+
+@pytest.fixture(scope="module")
 def hass():
-    """Create a mock Home Assistant instance."""
-    mock_hass = Mock(spec=HomeAssistant)
+    """Create a mock Home Assistant instance, shared by a test module."""
+    mock_hass = _FakeHass()
     mock_hass.data = {}
     mock_hass.config = Mock()
     mock_hass.config.path = Mock(return_value="/tmp/homeassistant")
-    
+
     # Mock bus and event system
     mock_hass.bus = Mock()
     mock_hass.bus.async_listen_once = AsyncMock(return_value=Mock())
-    
+
     # Mock config_entries with proper flow manager methods
     mock_hass.config_entries = Mock()
     mock_hass.config_entries.async_add = AsyncMock()
@@ -115,19 +120,29 @@ def hass():
     mock_hass.config_entries.flow.async_progress = Mock(return_value=[])
     mock_hass.config_entries.async_unique_id = Mock()
 
-    # Mock the async_add_executor_job method
-    async def mock_add_executor_job(func, *args):
+    # Run executor jobs inline
+    async def _async_run(func, *args):
         return func(*args)
 
-    mock_hass.async_add_executor_job = mock_add_executor_job
+    mock_hass.async_add_executor_job = _async_run
     return mock_hass
 
 
+@dataclass(frozen=True, slots=True)
+class _FakeEntry:
+    """Minimal stand-in for ConfigEntry exposing only what the tests use."""
+
+    entry_id: str
+    domain: str
+    unique_id: str
+    data: dict[str, Any]
+    title: str
+
+
 @pytest.fixture
 def mock_config_entry():
     """Create a mock config entry."""
-    return Mock(
-        spec=ConfigEntry,
+    return _FakeEntry(
         entry_id="test_entry_id",
         domain="yandex_disk_backup",
         unique_id="yandex_disk_test_unique_id",
@@ -139,49 +154,51 @@ def mock_config_entry():
     )
 
 
+# Fixed timestamp for mocked file metadata; tests don't depend on the clock
+_NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+# Default listdir entry, shared by every mock client
+_DEFAULT_LIST_ITEM = SimpleNamespace(
+    name="backup.tar",
+    type="file",
+    created=_NOW,
+    resource_id=None,
+)
+
+
+async def _listdir_default(path):
+    """Yield the default listdir entry (listdir is an async generator)."""
+    yield _DEFAULT_LIST_ITEM
+
+
 @pytest.fixture
 def mock_yadisk_client():
     """Create a mock yadisk AsyncClient."""
     client = AsyncMock()
 
     # Setup default disk info mock
-    disk_info = Mock()
-    disk_info.total_space = 10 * 1024**3  # 10 GB
-    disk_info.used_space = 2 * 1024**3     # 2 GB (free_space calculated: 8 GB)
-
-    async def get_disk_info_impl():
-        return disk_info
-
-    client.get_disk_info = AsyncMock(side_effect=get_disk_info_impl)
+    disk_info = SimpleNamespace(
+        total_space=10 * 1024**3,  # 10 GB
+        used_space=2 * 1024**3,  # 2 GB (free_space calculated: 8 GB)
+    )
+    client.get_disk_info = AsyncMock(return_value=disk_info)
 
     # Setup default metadata mock
-    meta = Mock()
-    meta.name = "backup.tar"
-    meta.size = 1024 * 1024  # 1 MB
-    meta.created = datetime.now()
-    meta.type = "file"
-
-    async def get_meta_impl(path):
-        return meta
-
-    client.get_meta = AsyncMock(side_effect=get_meta_impl)
+    meta = SimpleNamespace(
+        name="backup.tar",
+        size=1024 * 1024,  # 1 MB
+        created=_NOW,
+        type="file",
+    )
+    client.get_meta = AsyncMock(return_value=meta)
 
     # Setup default listdir mock - returns async generator
-    list_item = Mock()
-    list_item.name = "backup.tar"
-    list_item.type = "file"
-    list_item.created = datetime.now()
-
-    async def listdir_impl(path):
-        yield list_item
-
-    client.listdir = listdir_impl
+    client.listdir = _listdir_default
 
     # Setup download link mock
-    async def get_download_link_impl(path):
-        return "https://disk.yandex.ru/download/abc123"
-
-    client.get_download_link = AsyncMock(side_effect=get_download_link_impl)
+    client.get_download_link = AsyncMock(
+        return_value="https://disk.yandex.ru/download/abc123"
+    )
 
     # Setup other methods
     client.upload = AsyncMock()
@@ -192,6 +209,66 @@ def mock_yadisk_client():
     return client
 
 
+@pytest.fixture
+def make_listdir(mock_yadisk_client):
+    """Return a helper that fills the mock client's backup folder.
+
+    The helper takes (name, type) entries for listdir and answers get_meta
+    for any path with a file of the given size.
+    """
+
+    def _make(entries, size=1024):
+        items = []
+        for name, item_type in entries:
+            item = SimpleNamespace(
+                name=name,
+                type=item_type,
+                created=_NOW,
+                resource_id=None,
+            )
+            items.append(item)
+
+        async def listdir_impl(path):
+            for item in items:
+                yield item
+
+        async def get_meta_impl(path):
+            meta = SimpleNamespace(
+                name=path.rpartition("/")[2],
+                size=size,
+                created=_NOW,
+            )
+            return meta
+
+        mock_yadisk_client.listdir = listdir_impl
+        mock_yadisk_client.get_meta.side_effect = get_meta_impl
+
+    return _make
+
+
+@pytest.fixture(autouse=True)
+def reset_hass(hass):
+    """Clear state the shared hass mock picked up during a test."""
+    yield
+    hass.data.clear()
+    hass.config.reset_mock()
+    hass.bus.reset_mock()
+    hass.config_entries.reset_mock()
+
+
+@pytest.fixture(autouse=True)
+def clear_token_validation_cache():
+    """Start every test with an empty token validation cache."""
+    config_flow._TOKEN_VALIDATION_CACHE.clear()
+    yield
+    config_flow._TOKEN_VALIDATION_CACHE.clear()
+
+
+async def _chunk_iter():
+    """Yield the default downloaded body."""
+    yield b"test_data"
+
+
 @pytest.fixture(autouse=True)
 def mock_http_session():
     """Automatically mock HTTP session for all tests."""
@@ -199,42 +276,54 @@ def mock_http_session():
     mock_response = AsyncMock()
     mock_response.status = 200
     mock_response.raise_for_status = Mock()
+    # No Accept-Ranges header: downloads use a single GET by default
+    mock_response.headers = {}
 
-    # Create async chunk iterator
-    async def chunk_iterator(size=1024):
-        yield b"test_data"
-
+    # Every iter_chunked call gets a fresh generator, so a response can be
+    # streamed more than once in a test
     mock_response.content = AsyncMock()
-    mock_response.content.iter_chunked = Mock(return_value=chunk_iterator())
+    mock_response.content.iter_chunked = Mock(
+        side_effect=lambda _size=1024: _chunk_iter()
+    )
     mock_response.__aenter__ = AsyncMock(return_value=mock_response)
     mock_response.__aexit__ = AsyncMock()
 
     # Create mock session
     mock_session = AsyncMock()
     mock_session.get = Mock(return_value=mock_response)
+    mock_session.head = Mock(return_value=mock_response)
     mock_session.put = Mock(return_value=mock_response)
 
-    # Mock async_get_clientsession to return our mock session
-    with patch("custom_components.yandex_disk_backup.backup.async_get_clientsession", return_value=mock_session):
+    # Mock async_get_clientsession to return our mock session; yadisk sessions
+    # wrap its connector, so they are mocked out as well
+    with (
+        patch("custom_components.yandex_disk_backup.backup.async_get_clientsession", return_value=mock_session),
+        patch("custom_components.yandex_disk_backup.backup.AIOHTTPSession"),
+    ):
         yield mock_session
 
 
-@pytest.fixture
-def backup_agent(
+@pytest_asyncio.fixture
+async def backup_agent(
     hass: HomeAssistant,
     mock_config_entry: ConfigEntry,
     mock_yadisk_client: AsyncMock,
 ):
     """Create a YandexDiskBackupAgent fixture."""
-    with patch(
-        "custom_components.yandex_disk_backup.backup.AsyncClient",
-        return_value=mock_yadisk_client,
+    with (
+        patch(
+            "custom_components.yandex_disk_backup.backup.AsyncClient",
+            return_value=mock_yadisk_client,
+        ),
+        patch(
+            "custom_components.yandex_disk_backup.backup.AIOHTTPSession",
+            return_value=AsyncMock(),
+        ),
     ):
         agent = YandexDiskBackupAgent(
             hass, mock_config_entry.data, mock_config_entry.unique_id
         )
         yield agent
-        # Cleanup
+        # Cleanup on the test's own event loop
         if agent._client:
-            import asyncio
-            asyncio.run(agent.async_close())
+            await agent.async_close()
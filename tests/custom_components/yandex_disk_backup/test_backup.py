@@ -1,9 +1,14 @@
 """Tests for Yandex Disk backup agent."""
 
+import asyncio
+import json
+import tracemalloc
 from datetime import datetime
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+from aiohttp import ClientError
 from homeassistant.components.backup import AgentBackup
 from homeassistant.components.backup.agent import (
     BackupAgentError,
@@ -12,16 +17,31 @@ from homeassistant.components.backup.agent import (
 from yadisk.exceptions import (
     InsufficientStorageError,
     NotFoundError,
+    TooManyRequestsError,
     UnauthorizedError,
+    YaDiskConnectionError,
     YaDiskError,
 )
 
+from custom_components.yandex_disk_backup.backup import (
+    YandexDiskBackupAgent,
+    async_register_backup_agents_listener,
+)
 from custom_components.yandex_disk_backup.const import (
+    CHUNK_SIZE,
     CONF_BACKUP_FOLDER,
     CONF_TOKEN,
+    DATA_BACKUP_AGENT_LISTENERS,
+    DATA_YADISK_SESSION,
     DEFAULT_BACKUP_FOLDER,
+    DISK_INFO_CACHE_TTL,
+    LIST_CACHE_TTL,
+    UPLOAD_CHUNK_SIZE,
 )
 
+# Fixed timestamp for mocked file metadata; tests don't depend on the clock
+_NOW = datetime(2024, 1, 1, 12, 0, 0)
+
 
 @pytest.mark.asyncio
 async def test_upload_backup_success(backup_agent, mock_yadisk_client, mock_http_session):
@@ -30,7 +50,7 @@ async def test_upload_backup_success(backup_agent, mock_yadisk_client, mock_http
         backup_id="core.2026-01-08.tar",
         name="core.2026-01-08.tar",
         size=1024 * 1024,  # 1 MB
-        date=datetime.now().isoformat(),
+        date=_NOW.isoformat(),
         addons=[],
         database_included=False,
         extra_metadata={},
@@ -58,28 +78,165 @@ async def test_upload_backup_success(backup_agent, mock_yadisk_client, mock_http
 
     # Verify client.upload() was called twice:
     # 1. For the backup file with throttling bypass enabled
-    # 2. For the metadata sidecar file
+    # 2. For the metadata sidecar file, once the backup is uploaded
     assert mock_yadisk_client.upload.call_count == 2
+    backup_call, metadata_call = mock_yadisk_client.upload.call_args_list
+    backup_path = backup_call.args[1]
+    metadata_path = metadata_call.args[1]
+
+    # The backup file has throttling bypass enabled
+    assert backup_path.endswith(".tar")
+    assert backup_call.kwargs.get("spoof_user_agent") is True
+    assert backup_call.kwargs.get("overwrite") is True
+
+    # The metadata sidecar sits next to the backup file
+    assert metadata_path == backup_path.removesuffix(".tar") + ".metadata.json"
+    assert metadata_call.kwargs.get("overwrite") is True
+
+
+@pytest.mark.asyncio
+async def test_upload_backup_coalesces_small_chunks(backup_agent, mock_yadisk_client):
+    """Test that small stream reads are coalesced into larger upload blocks."""
+    backup = AgentBackup(
+        backup_id="core.2026-01-08.tar",
+        name="core.2026-01-08.tar",
+        size=10,
+        date=_NOW.isoformat(),
+        addons=[],
+        database_included=False,
+        extra_metadata={},
+        folders=[],
+        homeassistant_included=True,
+        homeassistant_version="2024.1.0",
+        protected=False,
+    )
+
+    async def mock_stream():
+        yield b"yyyyy"
+        for _ in range(10):
+            yield b"x"
+
+    async def mock_open_stream():
+        return mock_stream()
+
+    uploaded: dict[str, list[bytes]] = {}
+
+    async def mock_upload(file_or_generator, path, **kwargs):
+        uploaded[path] = [chunk async for chunk in file_or_generator()]
+
+    mock_yadisk_client.upload.side_effect = mock_upload
+
+    with patch("custom_components.yandex_disk_backup.backup.UPLOAD_CHUNK_SIZE", 4):
+        await backup_agent.async_upload_backup(
+            open_stream=mock_open_stream,
+            backup=backup,
+        )
+
+    # Backup file upload: a large read passes through, then 10 one-byte
+    # reads are coalesced into 4 + 4 + trailing 2
+    backup_path = next(path for path in uploaded if path.endswith(".tar"))
+    assert uploaded[backup_path] == [b"yyyyy", b"xxxx", b"xxxx", b"xx"]
+
+
+@pytest.mark.asyncio
+async def test_upload_backup_streams_without_buffering(backup_agent, mock_yadisk_client):
+    """Test that upload memory stays bounded by the block size, not the backup."""
+    chunk_size = 64 * 1024
+    chunk_count = 1000
+    backup = AgentBackup(
+        backup_id="core.2026-01-08.tar",
+        name="core.2026-01-08.tar",
+        size=chunk_size * chunk_count,
+        date=_NOW.isoformat(),
+        addons=[],
+        database_included=False,
+        extra_metadata={},
+        folders=[],
+        homeassistant_included=True,
+        homeassistant_version="2024.1.0",
+        protected=False,
+    )
+
+    async def mock_stream():
+        for _ in range(chunk_count):
+            yield bytes(chunk_size)
+
+    async def mock_open_stream():
+        return mock_stream()
+
+    uploaded_sizes: dict[str, int] = {}
+
+    async def mock_upload(file_or_generator, path, **kwargs):
+        uploaded_sizes[path] = sum([len(chunk) async for chunk in file_or_generator()])
+
+    mock_yadisk_client.upload.side_effect = mock_upload
+
+    tracemalloc.start()
+    try:
+        await backup_agent.async_upload_backup(
+            open_stream=mock_open_stream,
+            backup=backup,
+        )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    backup_path = next(path for path in uploaded_sizes if path.endswith(".tar"))
+    assert uploaded_sizes[backup_path] == backup.size
+    # A coalescing buffer plus the block being sent, far below the 62.5 MB backup
+    assert peak < 4 * UPLOAD_CHUNK_SIZE
+
+
+@pytest.mark.asyncio
+async def test_upload_backup_failure_leaves_no_sidecar(
+    backup_agent, mock_yadisk_client
+):
+    """Test that a failed backup upload does not leave a metadata sidecar."""
+    uploaded: set[str] = set()
+
+    async def mock_upload(generator, path, **kwargs):
+        if path.endswith(".tar"):
+            raise YaDiskError("Upload failed")
+        uploaded.add(path)
+
+    mock_yadisk_client.upload.side_effect = mock_upload
+
+    backup = AgentBackup(
+        backup_id="failed_backup.tar",
+        name="failed_backup.tar",
+        size=1024,
+        date=_NOW.isoformat(),
+        addons=[],
+        database_included=False,
+        extra_metadata={},
+        folders=[],
+        homeassistant_included=True,
+        homeassistant_version=None,
+        protected=False,
+    )
 
-    # Check the first call (backup file) has throttling bypass enabled
-    first_call_kwargs = mock_yadisk_client.upload.call_args_list[0].kwargs
-    assert first_call_kwargs.get("spoof_user_agent") is True
-    assert first_call_kwargs.get("overwrite") is True
+    async def mock_stream():
+        yield b"x" * 1024
 
-    # Check the second call (metadata file) contains metadata.json in the path
-    second_call_args = mock_yadisk_client.upload.call_args_list[1][0]
-    second_call_kwargs = mock_yadisk_client.upload.call_args_list[1].kwargs
-    assert ".metadata.json" in second_call_args[1]
-    assert second_call_kwargs.get("overwrite") is True
+    async def mock_open_stream():
+        return mock_stream()
+
+    with pytest.raises(BackupAgentUnreachableError):
+        await backup_agent.async_upload_backup(
+            open_stream=mock_open_stream, backup=backup
+        )
+
+    assert not any(path.endswith(".metadata.json") for path in uploaded)
 
 
 @pytest.mark.asyncio
 async def test_upload_backup_insufficient_storage(backup_agent, mock_yadisk_client):
     """Test upload with insufficient storage."""
     # Mock insufficient storage (10GB total - 9.5GB used = 0.5GB free, need 1GB)
-    disk_info = Mock()
-    disk_info.total_space = 10 * 1024**3
-    disk_info.used_space = int(9.5 * 1024**3)  # Only 0.5GB free (calculated), less than 1GB backup size
+    disk_info = SimpleNamespace(
+        total_space=10 * 1024**3,
+        used_space=int(9.5 * 1024**3),  # Only 0.5GB free (calculated), less than 1GB backup size
+    )
 
     async def mock_get_disk_info():
         return disk_info
@@ -90,7 +247,7 @@ async def test_upload_backup_insufficient_storage(backup_agent, mock_yadisk_clie
         backup_id="large_backup.tar",
         name="large_backup.tar",
         size=1024**3,  # 1 GB needed
-        date=datetime.now().isoformat(),
+        date=_NOW.isoformat(),
         addons=[],
         database_included=False,
         extra_metadata={},
@@ -133,7 +290,7 @@ async def test_download_backup_success(backup_agent, mock_yadisk_client, mock_ht
 
     # Access the mock response through the session
     mock_response = mock_http_session.get.return_value
-    mock_response.content.iter_chunked.return_value = chunk_iterator()
+    mock_response.content.iter_chunked.side_effect = lambda _size: chunk_iterator()
 
     # Download backup - need to await first since async_download_backup now returns the iterator
     stream = await backup_agent.async_download_backup(backup_id)
@@ -143,6 +300,203 @@ async def test_download_backup_success(backup_agent, mock_yadisk_client, mock_ht
 
     assert len(chunks) == 2
     assert chunks == [b"chunk1", b"chunk2"]
+    # Large blocks keep the number of awaits per download low
+    mock_response.content.iter_chunked.assert_called_once_with(CHUNK_SIZE)
+
+
+@pytest.mark.asyncio
+async def test_download_backup_parallel_ranges(backup_agent, mock_http_session):
+    """Test that downloads are split into ordered byte-range segments."""
+    content = bytes(range(256)) * 4  # 1 KiB
+    head_response = AsyncMock()
+    head_response.raise_for_status = Mock()
+    head_response.headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(len(content)),
+    }
+    head_response.url = "https://downloader.disk.yandex.ru/abc123"
+    head_response.__aenter__ = AsyncMock(return_value=head_response)
+    head_response.__aexit__ = AsyncMock()
+    mock_http_session.head = Mock(return_value=head_response)
+
+    def ranged_get(url, headers):
+        start, end = map(int, headers["Range"].removeprefix("bytes=").split("-"))
+        response = AsyncMock()
+        response.status = 206
+        response.raise_for_status = Mock()
+        response.read = AsyncMock(return_value=content[start : end + 1])
+        response.__aenter__ = AsyncMock(return_value=response)
+        response.__aexit__ = AsyncMock()
+        return response
+
+    mock_http_session.get = Mock(side_effect=ranged_get)
+
+    with patch(
+        "custom_components.yandex_disk_backup.backup.DOWNLOAD_SEGMENT_SIZE", 100
+    ):
+        stream = await backup_agent.async_download_backup("core.2026-01-08.tar")
+        chunks = [chunk async for chunk in stream]
+
+    assert b"".join(chunks) == content
+    assert len(chunks) == 11
+    assert mock_http_session.get.call_args_list[0].args[0] == head_response.url
+
+
+@pytest.mark.asyncio
+async def test_download_backup_retries_failed_segment(backup_agent, mock_http_session):
+    """Test that a failed byte-range segment is retried on its own."""
+    content = b"0123456789" * 30
+    head_response = AsyncMock()
+    head_response.raise_for_status = Mock()
+    head_response.headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(len(content)),
+    }
+    head_response.url = "https://downloader.disk.yandex.ru/abc123"
+    head_response.__aenter__ = AsyncMock(return_value=head_response)
+    head_response.__aexit__ = AsyncMock()
+    mock_http_session.head = Mock(return_value=head_response)
+
+    failed_ranges: set[str] = set()
+
+    def ranged_get(url, headers):
+        start, end = map(int, headers["Range"].removeprefix("bytes=").split("-"))
+        response = AsyncMock()
+        response.status = 206
+        response.raise_for_status = Mock()
+        if start == 100 and headers["Range"] not in failed_ranges:
+            failed_ranges.add(headers["Range"])
+            response.raise_for_status.side_effect = ClientError("Connection reset")
+        response.read = AsyncMock(return_value=content[start : end + 1])
+        response.__aenter__ = AsyncMock(return_value=response)
+        response.__aexit__ = AsyncMock(return_value=False)
+        return response
+
+    mock_http_session.get = Mock(side_effect=ranged_get)
+
+    with (
+        patch("custom_components.yandex_disk_backup.backup.DOWNLOAD_SEGMENT_SIZE", 100),
+        patch("custom_components.yandex_disk_backup.backup.DOWNLOAD_RETRY_INTERVAL", 0),
+    ):
+        stream = await backup_agent.async_download_backup("core.2026-01-08.tar")
+        chunks = [chunk async for chunk in stream]
+
+    assert b"".join(chunks) == content
+    # Three segments plus one retry
+    assert mock_http_session.get.call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_download_backup_retries_short_segment(backup_agent, mock_http_session):
+    """Test that a segment shorter than its range is retried, not yielded."""
+    content = b"0123456789" * 30
+    head_response = AsyncMock()
+    head_response.raise_for_status = Mock()
+    head_response.headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(len(content)),
+    }
+    head_response.url = "https://downloader.disk.yandex.ru/abc123"
+    head_response.__aenter__ = AsyncMock(return_value=head_response)
+    head_response.__aexit__ = AsyncMock()
+    mock_http_session.head = Mock(return_value=head_response)
+
+    truncated_ranges: set[str] = set()
+
+    def ranged_get(url, headers):
+        start, end = map(int, headers["Range"].removeprefix("bytes=").split("-"))
+        response = AsyncMock()
+        response.status = 206
+        response.raise_for_status = Mock()
+        data = content[start : end + 1]
+        if start == 100 and headers["Range"] not in truncated_ranges:
+            truncated_ranges.add(headers["Range"])
+            data = data[:-10]
+        response.read = AsyncMock(return_value=data)
+        response.__aenter__ = AsyncMock(return_value=response)
+        response.__aexit__ = AsyncMock(return_value=False)
+        return response
+
+    mock_http_session.get = Mock(side_effect=ranged_get)
+
+    with (
+        patch("custom_components.yandex_disk_backup.backup.DOWNLOAD_SEGMENT_SIZE", 100),
+        patch("custom_components.yandex_disk_backup.backup.DOWNLOAD_RETRY_INTERVAL", 0),
+    ):
+        stream = await backup_agent.async_download_backup("core.2026-01-08.tar")
+        chunks = [chunk async for chunk in stream]
+
+    assert b"".join(chunks) == content
+    # Three segments plus one retry
+    assert mock_http_session.get.call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_download_segments_close_waits_for_pending(
+    backup_agent, mock_http_session
+):
+    """Test that closing a segmented download leaves no segment running."""
+    content = b"0123456789" * 30
+    started: set[int] = set()
+    finished: set[int] = set()
+
+    def ranged_get(url, headers):
+        start, end = map(int, headers["Range"].removeprefix("bytes=").split("-"))
+        response = AsyncMock()
+        response.status = 206
+        response.raise_for_status = Mock()
+
+        async def read():
+            started.add(start)
+            try:
+                if start > 0:
+                    # Later segments never arrive
+                    await asyncio.Event().wait()
+                return content[start : end + 1]
+            finally:
+                finished.add(start)
+
+        response.read = read
+        response.__aenter__ = AsyncMock(return_value=response)
+        response.__aexit__ = AsyncMock(return_value=False)
+        return response
+
+    mock_http_session.get = Mock(side_effect=ranged_get)
+
+    with patch(
+        "custom_components.yandex_disk_backup.backup.DOWNLOAD_SEGMENT_SIZE", 100
+    ):
+        segments = backup_agent._download_segments(
+            mock_http_session, "https://downloader.disk.yandex.ru/abc123", len(content)
+        )
+        assert await anext(segments) == content[:100]
+        await segments.aclose()
+
+    assert len(started) > 1
+    assert finished == started
+
+
+@pytest.mark.asyncio
+async def test_download_backup_probe_timeout_uses_single_get(
+    backup_agent, mock_http_session
+):
+    """Test that a timed out range probe falls back to a single GET."""
+    mock_http_session.head = Mock(side_effect=TimeoutError())
+
+    async def chunk_iterator():
+        yield b"chunk1"
+        yield b"chunk2"
+
+    mock_response = mock_http_session.get.return_value
+    mock_response.content.iter_chunked.side_effect = lambda _size: chunk_iterator()
+
+    stream = await backup_agent.async_download_backup("core.2026-01-08.tar")
+    chunks = [chunk async for chunk in stream]
+
+    assert chunks == [b"chunk1", b"chunk2"]
+    # One plain GET, without a Range header
+    mock_http_session.get.assert_called_once()
+    assert "headers" not in mock_http_session.get.call_args.kwargs
 
 
 @pytest.mark.asyncio
@@ -161,20 +515,15 @@ async def test_delete_backup_success(backup_agent, mock_yadisk_client):
 
     # Verify remove was called twice:
     # 1. For the backup file
-    # 2. For the metadata sidecar file
-    assert mock_yadisk_client.remove.call_count == 2
+    # 2. For the metadata sidecar file, once the backup is gone
+    assert [c.args[0] for c in mock_yadisk_client.remove.call_args_list] == [
+        f"{DEFAULT_BACKUP_FOLDER}/old_backup.tar",
+        f"{DEFAULT_BACKUP_FOLDER}/old_backup.metadata.json",
+    ]
 
-    # Check the first call (backup file) uses permanently=False (trash)
-    first_call_args = mock_yadisk_client.remove.call_args_list[0][0]
-    first_call_kwargs = mock_yadisk_client.remove.call_args_list[0].kwargs
-    assert first_call_args[0] == f"{DEFAULT_BACKUP_FOLDER}/old_backup.tar"
-    assert first_call_kwargs.get("permanently") is False
-
-    # Check the second call (metadata file) uses permanently=False (trash)
-    second_call_args = mock_yadisk_client.remove.call_args_list[1][0]
-    second_call_kwargs = mock_yadisk_client.remove.call_args_list[1].kwargs
-    assert ".metadata.json" in second_call_args[0]
-    assert second_call_kwargs.get("permanently") is False
+    # Both files are moved to the trash (permanently=False)
+    for call in mock_yadisk_client.remove.call_args_list:
+        assert call.kwargs.get("permanently") is False
 
 
 @pytest.mark.asyncio
@@ -186,6 +535,52 @@ async def test_delete_backup_not_found(backup_agent, mock_yadisk_client):
     await backup_agent.async_delete_backup("already_deleted.tar")
 
 
+@pytest.mark.asyncio
+async def test_delete_backup_error_keeps_metadata(backup_agent, mock_yadisk_client):
+    """Test that the sidecar survives a failed backup removal."""
+    mock_yadisk_client.remove.side_effect = YaDiskError("Server error")
+
+    with pytest.raises(BackupAgentUnreachableError):
+        await backup_agent.async_delete_backup("old_backup.tar")
+
+    mock_yadisk_client.remove.assert_called_once_with(
+        f"{DEFAULT_BACKUP_FOLDER}/old_backup.tar", permanently=False
+    )
+
+
+@pytest.mark.asyncio
+async def test_delete_backups_concurrently(backup_agent, mock_yadisk_client):
+    """Test that bulk deletion runs up to the concurrency limit at once."""
+    limit = 4
+    in_flight = 0
+    max_in_flight = 0
+    release = asyncio.Event()
+
+    async def mock_remove(path, **kwargs):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # Hold every removal until the limit is reached
+        if in_flight == limit:
+            release.set()
+        await release.wait()
+        in_flight -= 1
+
+    mock_yadisk_client.remove.side_effect = mock_remove
+
+    with patch(
+        "custom_components.yandex_disk_backup.backup.DELETE_CONCURRENCY", limit
+    ):
+        await asyncio.wait_for(
+            backup_agent.async_delete_backups(f"old{i}.tar" for i in range(10)),
+            timeout=5,
+        )
+
+    # Each backup removes its file and its metadata sidecar
+    assert mock_yadisk_client.remove.call_count == 20
+    assert max_in_flight == limit
+
+
 @pytest.mark.asyncio
 async def test_list_backups_success(backup_agent, mock_yadisk_client):
     """Test successful backup listing."""
@@ -197,47 +592,71 @@ async def test_list_backups_success(backup_agent, mock_yadisk_client):
 
 
 @pytest.mark.asyncio
-async def test_list_backups_filters_non_backup_files(backup_agent, mock_yadisk_client):
-    """Test that listing filters out non-backup files."""
-    # Mock listdir with mixed file types
-    item1 = Mock()
-    item1.name = "backup.tar"
-    item1.type = "file"
-    item1.created = datetime.now()
-
-    item2 = Mock()
-    item2.name = "readme.txt"
-    item2.type = "file"
-    item2.created = datetime.now()
-
-    item3 = Mock()
-    item3.name = "backup2.tar.gz"
-    item3.type = "file"
-    item3.created = datetime.now()
-
-    item4 = Mock()
-    item4.name = "folder"
-    item4.type = "dir"
-    item4.created = datetime.now()
-
-    # Create async generator for listdir
-    async def listdir_impl(path):
-        yield item1
-        yield item2
-        yield item3
-        yield item4
+async def test_list_backups_skips_file_without_size(backup_agent, mock_yadisk_client):
+    """Test that a file Yandex Disk reports without a size is not listed."""
+    meta = SimpleNamespace(name="backup.tar", size=None, created=_NOW)
+    mock_yadisk_client.get_meta.return_value = meta
 
-    mock_yadisk_client.listdir = listdir_impl
+    assert await backup_agent.async_list_backups() == []
 
-    # Mock get_meta for each backup file
-    async def mock_get_meta(path):
-        meta = Mock()
-        meta.name = path.split("/")[-1]
-        meta.size = 1024
-        meta.created = datetime.now()
-        return meta
 
-    mock_yadisk_client.get_meta.side_effect = mock_get_meta
+@pytest.mark.asyncio
+async def test_list_backups_uses_metadata_sidecar(
+    backup_agent, mock_yadisk_client, mock_http_session
+):
+    """Test that sidecar metadata is used, with backup_id set to the filename."""
+    metadata = AgentBackup(
+        backup_id="9cb25c63",
+        name="Automatic backup 2026.1.0",
+        size=2048,
+        date="2026-01-11T17:16:57+00:00",
+        addons=[],
+        database_included=True,
+        extra_metadata={"with_automatic_settings": True},
+        folders=[],
+        homeassistant_included=True,
+        homeassistant_version="2026.1.0",
+        protected=False,
+    ).as_dict()
+    mock_response = mock_http_session.get.return_value
+    mock_response.read = AsyncMock(return_value=json.dumps(metadata).encode())
+
+    backups = await backup_agent.async_list_backups()
+
+    assert len(backups) == 1
+    assert backups[0].backup_id == "backup.tar"
+    assert backups[0].name == "Automatic backup 2026.1.0"
+    assert backups[0].extra_metadata == {"with_automatic_settings": True}
+    mock_yadisk_client.get_meta.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_list_backups_ignores_invalid_metadata_sidecar(
+    backup_agent, mock_yadisk_client, mock_http_session
+):
+    """Test that a corrupt sidecar falls back to file metadata."""
+    mock_response = mock_http_session.get.return_value
+    mock_response.__aexit__ = AsyncMock(return_value=False)
+    mock_response.read = AsyncMock(return_value=b"{not json")
+
+    backups = await backup_agent.async_list_backups()
+
+    assert len(backups) == 1
+    assert backups[0].backup_id == "backup.tar"
+    assert backups[0].size == 1024 * 1024
+
+
+@pytest.mark.asyncio
+async def test_list_backups_filters_non_backup_files(backup_agent, make_listdir):
+    """Test that listing filters out non-backup files."""
+    make_listdir(
+        [
+            ("backup.tar", "file"),
+            ("readme.txt", "file"),
+            ("backup2.tar.gz", "file"),
+            ("folder", "dir"),
+        ]
+    )
 
     backups = await backup_agent.async_list_backups()
 
@@ -247,6 +666,32 @@ async def test_list_backups_filters_non_backup_files(backup_agent, mock_yadisk_c
     assert backup_ids == {"backup.tar", "backup2.tar.gz"}
 
 
+@pytest.mark.asyncio
+async def test_list_backups_sorted_newest_first(backup_agent, mock_yadisk_client):
+    """Test that listed backups are sorted by date, newest first."""
+    created = {
+        "old.tar": datetime(2025, 1, 1),
+        "new.tar": datetime(2026, 1, 1),
+        "mid.tar": datetime(2025, 6, 1),
+    }
+
+    async def listdir_impl(path):
+        for name in created:
+            item = SimpleNamespace(name=name, type="file", resource_id=None)
+            yield item
+
+    async def mock_get_meta(path):
+        name = path.split("/")[-1]
+        return SimpleNamespace(name=name, size=1024, created=created[name])
+
+    mock_yadisk_client.listdir = listdir_impl
+    mock_yadisk_client.get_meta.side_effect = mock_get_meta
+
+    backups = await backup_agent.async_list_backups()
+
+    assert [b.backup_id for b in backups] == ["new.tar", "mid.tar", "old.tar"]
+
+
 @pytest.mark.asyncio
 async def test_list_backups_creates_folder_if_missing(backup_agent, mock_yadisk_client):
     """Test that listing creates folder if it doesn't exist."""
@@ -283,6 +728,66 @@ async def test_get_backup_not_found(backup_agent, mock_yadisk_client):
         await backup_agent.async_get_backup("missing.tar")
 
 
+@pytest.mark.asyncio
+async def test_get_backup_after_list_uses_listing(backup_agent, mock_yadisk_client):
+    """Test that a lookup right after a listing needs no extra request."""
+    backups = await backup_agent.async_list_backups()
+    get_meta_calls = mock_yadisk_client.get_meta.call_count
+
+    backup = await backup_agent.async_get_backup("backup.tar")
+
+    assert backup == backups[0]
+    assert mock_yadisk_client.get_meta.call_count == get_meta_calls
+
+
+@pytest.mark.asyncio
+async def test_list_cache_expires(backup_agent, mock_yadisk_client):
+    """Test that the listing stops answering lookups after the TTL."""
+    with patch(
+        "custom_components.yandex_disk_backup.backup.monotonic", return_value=1000.0
+    ) as mock_monotonic:
+        await backup_agent.async_list_backups()
+        get_meta_calls = mock_yadisk_client.get_meta.call_count
+
+        mock_monotonic.return_value = 1000.0 + LIST_CACHE_TTL
+        await backup_agent.async_get_backup("backup.tar")
+
+    assert mock_yadisk_client.get_meta.call_count == get_meta_calls + 1
+
+
+@pytest.mark.asyncio
+async def test_delete_backup_invalidates_list_cache(backup_agent, mock_yadisk_client):
+    """Test that a deleted backup is not served from an earlier listing."""
+    await backup_agent.async_list_backups()
+    await backup_agent.async_delete_backup("backup.tar")
+    mock_yadisk_client.get_meta.side_effect = NotFoundError("Not found")
+
+    with pytest.raises(BackupAgentError, match="Backup backup.tar not found"):
+        await backup_agent.async_get_backup("backup.tar")
+
+
+def test_serialize_metadata_round_trip():
+    """Test that the sidecar document decodes back to the backup metadata."""
+    backup = AgentBackup(
+        backup_id="9cb25c63",
+        name="Резервная копия",
+        size=2048,
+        date="2026-01-11T17:16:57+00:00",
+        addons=[],
+        database_included=True,
+        extra_metadata={"with_automatic_settings": True},
+        folders=[],
+        homeassistant_included=True,
+        homeassistant_version="2026.1.0",
+        protected=False,
+    )
+
+    content = YandexDiskBackupAgent._serialize_metadata(backup)
+
+    assert "Резервная копия".encode() in content
+    assert json.loads(content) == backup.as_dict()
+
+
 @pytest.mark.asyncio
 async def test_close_client(backup_agent, mock_yadisk_client):
     """Test closing the client."""
@@ -291,6 +796,68 @@ async def test_close_client(backup_agent, mock_yadisk_client):
     assert backup_agent._client is None
 
 
+@pytest.mark.asyncio
+async def test_close_shared_session(hass, mock_config_entry):
+    """Test that agents share one session closed by the last agent."""
+
+    def make_client(token, session):
+        client = AsyncMock()
+        client.session = session
+        client.close.side_effect = session.close
+        return client
+
+    with (
+        patch(
+            "custom_components.yandex_disk_backup.backup.AsyncClient",
+            side_effect=make_client,
+        ),
+        patch(
+            "custom_components.yandex_disk_backup.backup.AIOHTTPSession",
+            return_value=AsyncMock(),
+        ) as mock_session_class,
+    ):
+        agent1 = YandexDiskBackupAgent(hass, mock_config_entry.data, "agent1")
+        agent2 = YandexDiskBackupAgent(hass, mock_config_entry.data, "agent2")
+        client1 = await agent1._get_client()
+        client2 = await agent2._get_client()
+
+    assert mock_session_class.call_count == 1
+    assert client1.session is client2.session
+
+    await agent1.async_close()
+    await agent1.async_close()  # Idempotent: does not release twice
+    client1.session.close.assert_not_awaited()
+
+    await agent2.async_close()
+    client2.session.close.assert_awaited_once()
+    assert DATA_YADISK_SESSION not in hass.data
+
+
+@pytest.mark.asyncio
+async def test_client_reused_across_operations(
+    hass, mock_config_entry, mock_yadisk_client
+):
+    """Test that list, get and delete share one client and session."""
+    with (
+        patch(
+            "custom_components.yandex_disk_backup.backup.AsyncClient",
+            return_value=mock_yadisk_client,
+        ) as mock_client_class,
+        patch(
+            "custom_components.yandex_disk_backup.backup.AIOHTTPSession",
+            return_value=AsyncMock(),
+        ) as mock_session_class,
+    ):
+        agent = YandexDiskBackupAgent(hass, mock_config_entry.data, "agent")
+        await agent.async_list_backups()
+        await agent.async_get_backup("backup.tar")
+        await agent.async_delete_backup("backup.tar")
+
+    assert mock_client_class.call_count == 1
+    assert mock_session_class.call_count == 1
+    await agent.async_close()
+
+
 @pytest.mark.asyncio
 async def test_disk_info_caching(backup_agent, mock_yadisk_client):
     """Test that disk info is cached."""
@@ -306,6 +873,93 @@ async def test_disk_info_caching(backup_agent, mock_yadisk_client):
     assert mock_yadisk_client.get_disk_info.call_count == 1
 
 
+@pytest.mark.asyncio
+async def test_disk_info_concurrent_refresh(backup_agent, mock_yadisk_client):
+    """Test that concurrent cache misses trigger a single refresh."""
+    results = await asyncio.gather(
+        *(backup_agent._get_disk_info_cached() for _ in range(5))
+    )
+
+    assert all(info["free_space"] == 8 * 1024**3 for info in results)
+    assert mock_yadisk_client.get_disk_info.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_disk_info_cache_expires(backup_agent, mock_yadisk_client):
+    """Test that cached disk info is refreshed after the TTL."""
+    with patch(
+        "custom_components.yandex_disk_backup.backup.monotonic", return_value=1000.0
+    ) as mock_monotonic:
+        await backup_agent._get_disk_info_cached()
+        mock_monotonic.return_value = 1000.0 + DISK_INFO_CACHE_TTL - 1
+        await backup_agent._get_disk_info_cached()
+        assert mock_yadisk_client.get_disk_info.call_count == 1
+
+        mock_monotonic.return_value = 1000.0 + DISK_INFO_CACHE_TTL
+        await backup_agent._get_disk_info_cached()
+        assert mock_yadisk_client.get_disk_info.call_count == 2
+
+
+def _headroom_backup() -> AgentBackup:
+    """Return a 1 GB backup for the headroom tests."""
+    return AgentBackup(
+        backup_id="core.2026-01-08.tar",
+        name="core.2026-01-08.tar",
+        size=1024**3,
+        date=_NOW.isoformat(),
+        addons=[],
+        database_included=False,
+        extra_metadata={},
+        folders=[],
+        homeassistant_included=True,
+        homeassistant_version="2024.1.0",
+        protected=False,
+    )
+
+
+async def _open_one_byte_stream():
+    """Open a stream yielding a single byte."""
+
+    async def stream():
+        yield b"x"
+
+    return stream()
+
+
+@pytest.mark.asyncio
+async def test_upload_skips_disk_info_with_headroom(backup_agent, mock_yadisk_client):
+    """Test that uploads skip the free space check while cached headroom is ample."""
+    # 8 GB of 10 GB free: the first upload leaves 7 GB, the second 6 GB, both
+    # above the 1 GB headroom while the cache is fresh
+    with patch(
+        "custom_components.yandex_disk_backup.backup.monotonic", return_value=1000.0
+    ) as mock_monotonic:
+        await backup_agent._get_disk_info_cached()
+        mock_monotonic.return_value = 1000.0 + DISK_INFO_CACHE_TTL - 1
+        for _ in range(2):
+            await backup_agent.async_upload_backup(
+                open_stream=_open_one_byte_stream, backup=_headroom_backup()
+            )
+
+    assert mock_yadisk_client.get_disk_info.call_count == 1
+    assert backup_agent._disk_info_cache[0]["free_space"] == 6 * 1024**3
+
+
+@pytest.mark.asyncio
+async def test_upload_refetches_expired_disk_info(backup_agent, mock_yadisk_client):
+    """Test that expired disk info is refetched despite ample cached headroom."""
+    with patch(
+        "custom_components.yandex_disk_backup.backup.monotonic", return_value=1000.0
+    ) as mock_monotonic:
+        await backup_agent._get_disk_info_cached()
+        mock_monotonic.return_value = 1000.0 + DISK_INFO_CACHE_TTL
+        await backup_agent.async_upload_backup(
+            open_stream=_open_one_byte_stream, backup=_headroom_backup()
+        )
+
+    assert mock_yadisk_client.get_disk_info.call_count == 2
+
+
 @pytest.mark.asyncio
 async def test_yadisk_error_handling(backup_agent, mock_yadisk_client):
     """Test that yadisk errors are properly handled."""
@@ -320,85 +974,161 @@ async def test_yadisk_error_handling(backup_agent, mock_yadisk_client):
         await backup_agent.async_list_backups()
 
 
-def test_is_backup_file_with_extensions(backup_agent):
-    """Test that _is_backup_file recognizes traditional extensions."""
-    assert backup_agent._is_backup_file("backup.tar") is True
-    assert backup_agent._is_backup_file("backup.tar.gz") is True
-    assert backup_agent._is_backup_file("core.2024-01-01.tar") is True
-    assert backup_agent._is_backup_file("core.2024-01-01.tar.gz") is True
-
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error",
+    [
+        YaDiskConnectionError("Connection reset"),
+        TooManyRequestsError("Slow down"),
+        UnauthorizedError("Bad token"),
+    ],
+)
+async def test_yadisk_errors_mapped_consistently(backup_agent, mock_yadisk_client, error):
+    """Test that every operation translates yadisk errors the same way."""
+    mock_yadisk_client.get_download_link.side_effect = error
+    mock_yadisk_client.remove.side_effect = error
+    mock_yadisk_client.get_disk_info.side_effect = error
+
+    for operation in (
+        backup_agent.async_download_backup("core.2026-01-08.tar"),
+        backup_agent.async_delete_backup("core.2026-01-08.tar"),
+        backup_agent._get_disk_info_cached(),
+    ):
+        with pytest.raises(BackupAgentUnreachableError) as exc_info:
+            await operation
+        assert exc_info.value.__cause__ is error
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [
+        # Traditional extensions
+        ("backup.tar", True),
+        ("backup.tar.gz", True),
+        ("core.2024-01-01.tar", True),
+        ("core.2024-01-01.tar.gz", True),
+        # Home Assistant hash-style IDs: 8-64 lowercase hex characters
+        ("51d5f41c", True),
+        ("d6a0ed36", True),
+        ("a1b2c3d4", True),
+        ("a1b2c3d4e5f6", True),
+        ("a" * 64, True),
+        # Odd lengths are fine (these are hashes, not encoded bytes)
+        ("abc12345a", True),
+        # Wrong extensions
+        ("readme.txt", False),
+        ("image.jpg", False),
+        ("document.pdf", False),
+        # Too short for hash-style IDs
+        ("abc123", False),
+        ("a1b2", False),
+        # Contains non-hex characters
+        ("g1h2i3j4", False),
+        ("51d5f41c.txt", False),
+        ("51d5f41c\n", False),
+        ("51d5 f41c", False),
+        # Too long for hash-style IDs, or not lowercase
+        ("a" * 65, False),
+        ("51D5F41C", False),
+        # Empty string
+        ("", False),
+    ],
+)
+def test_is_backup_file(name, expected):
+    """Test which file names _is_backup_file accepts as backups."""
+    # A static method: no agent fixture is needed per case
+    assert YandexDiskBackupAgent._is_backup_file(name) is expected
 
-def test_is_backup_file_with_hash_style_ids(backup_agent):
-    """Test that _is_backup_file recognizes Home Assistant hash-style IDs."""
-    # 8-character hex strings (common format)
-    assert backup_agent._is_backup_file("51d5f41c") is True
-    assert backup_agent._is_backup_file("d6a0ed36") is True
-    assert backup_agent._is_backup_file("a1b2c3d4") is True
 
-    # Longer hex strings (up to 64 characters)
-    assert backup_agent._is_backup_file("a1b2c3d4e5f6") is True
-    assert backup_agent._is_backup_file("a" * 64) is True
+@pytest.mark.asyncio
+async def test_list_backups_includes_hash_style_ids(backup_agent, make_listdir):
+    """Test that listing includes hash-style backup IDs."""
+    make_listdir(
+        [("51d5f41c", "file"), ("d6a0ed36", "file"), ("readme.txt", "file")],
+        size=1024 * 1024,
+    )
 
+    backups = await backup_agent.async_list_backups()
 
-def test_is_backup_file_rejects_non_backup_files(backup_agent):
-    """Test that _is_backup_file rejects non-backup files."""
-    # Wrong extensions
-    assert backup_agent._is_backup_file("readme.txt") is False
-    assert backup_agent._is_backup_file("image.jpg") is False
-    assert backup_agent._is_backup_file("document.pdf") is False
+    # Should include hash-style IDs but not .txt files
+    assert len(backups) == 2
+    backup_ids = {b.backup_id for b in backups}
+    assert backup_ids == {"51d5f41c", "d6a0ed36"}
 
-    # Too short for hash-style IDs
-    assert backup_agent._is_backup_file("abc123") is False
-    assert backup_agent._is_backup_file("a1b2") is False
 
-    # Contains non-hex characters
-    assert backup_agent._is_backup_file("g1h2i3j4") is False
-    assert backup_agent._is_backup_file("51d5f41c.txt") is False
+def test_register_backup_agents_listener(hass):
+    """Test that listeners are kept in a set and removal keeps the bucket."""
+    listener = Mock()
+    remove = async_register_backup_agents_listener(hass, listener=listener)
+    assert hass.data[DATA_BACKUP_AGENT_LISTENERS] == {listener}
 
-    # Empty string
-    assert backup_agent._is_backup_file("") is False
+    remove()
+    # The bucket is kept so notify closures holding a reference stay valid
+    assert hass.data[DATA_BACKUP_AGENT_LISTENERS] == set()
+    # Removing twice is harmless
+    remove()
 
 
 @pytest.mark.asyncio
-async def test_list_backups_includes_hash_style_ids(backup_agent, mock_yadisk_client):
-    """Test that listing includes hash-style backup IDs."""
-    # Mock listdir with hash-style backup files
-    item1 = Mock()
-    item1.name = "51d5f41c"
-    item1.type = "file"
-    item1.created = datetime.now()
-
-    item2 = Mock()
-    item2.name = "d6a0ed36"
-    item2.type = "file"
-    item2.created = datetime.now()
-
-    item3 = Mock()
-    item3.name = "readme.txt"
-    item3.type = "file"
-    item3.created = datetime.now()
-
-    # Create async generator for listdir
+async def test_list_backups_fetches_metadata_concurrently(
+    backup_agent, mock_yadisk_client
+):
+    """Test that file metadata is fetched concurrently within the limit."""
+    names = [f"backup{i}.tar" for i in range(5)]
+
     async def listdir_impl(path):
-        yield item1
-        yield item2
-        yield item3
+        for name in names:
+            item = SimpleNamespace(name=name, type="file", resource_id=None)
+            yield item
 
     mock_yadisk_client.listdir = listdir_impl
+    mock_yadisk_client.get_download_link.side_effect = NotFoundError("No sidecar")
+
+    in_flight = 0
+    max_in_flight = 0
 
-    # Mock get_meta for each backup file
     async def mock_get_meta(path):
-        meta = Mock()
-        meta.name = path.split("/")[-1]
-        meta.size = 1024 * 1024
-        meta.created = datetime.now()
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        meta = SimpleNamespace(name=path.split("/")[-1], size=1024, created=_NOW)
         return meta
 
     mock_yadisk_client.get_meta.side_effect = mock_get_meta
 
+    with patch(
+        "custom_components.yandex_disk_backup.backup.METADATA_FETCH_CONCURRENCY", 2
+    ):
+        backups = await backup_agent.async_list_backups()
+
+    assert {b.backup_id for b in backups} == set(names)
+    assert max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_list_backups_fetches_sidecars_while_listing(
+    backup_agent, mock_yadisk_client
+):
+    """Test that sidecar fetches start before listdir has finished."""
+    sidecar_requested = asyncio.Event()
+
+    async def listdir_impl(path):
+        item = SimpleNamespace(name="first.tar", type="file", resource_id=None)
+        yield item
+        # The next page only arrives once the first sidecar was requested
+        await asyncio.wait_for(sidecar_requested.wait(), timeout=1)
+        item = SimpleNamespace(name="second.tar", type="file", resource_id=None)
+        yield item
+
+    async def mock_get_download_link(path):
+        sidecar_requested.set()
+        raise NotFoundError("No sidecar")
+
+    mock_yadisk_client.listdir = listdir_impl
+    mock_yadisk_client.get_download_link.side_effect = mock_get_download_link
+
     backups = await backup_agent.async_list_backups()
 
-    # Should include hash-style IDs but not .txt files
-    assert len(backups) == 2
-    backup_ids = {b.backup_id for b in backups}
-    assert backup_ids == {"51d5f41c", "d6a0ed36"}
+    assert {b.backup_id for b in backups} == {"first.tar", "second.tar"}
@@ -3,6 +3,7 @@
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
@@ -13,9 +14,21 @@ from custom_components.yandex_disk_backup.const import (
     CONF_BACKUP_FOLDER,
     CONF_TOKEN,
     DEFAULT_BACKUP_FOLDER,
+    TOKEN_VALIDATION_CACHE_TTL,
 )
 
 
+@pytest.fixture
+def mock_async_client():
+    """Patch the config flow's AsyncClient and yield the entered client."""
+    with patch(
+        "custom_components.yandex_disk_backup.config_flow.AsyncClient"
+    ) as mock_client_class:
+        mock_client = AsyncMock()
+        mock_client_class.return_value.__aenter__.return_value = mock_client
+        yield mock_client
+
+
 @pytest.mark.asyncio
 async def test_config_flow_valid_token(hass: HomeAssistant):
     """Test config flow with valid token."""
@@ -157,30 +170,74 @@ async def test_config_flow_already_configured(hass: HomeAssistant):
             assert exc_info.value.reason == "already_configured"
 
 
+def test_schema_rejects_short_token():
+    """Test that tokens too short for a unique_id fail schema validation."""
+    with pytest.raises(vol.Invalid):
+        config_flow.STEP_USER_DATA_SCHEMA({CONF_TOKEN: "short"})
+
+    data = config_flow.STEP_USER_DATA_SCHEMA({CONF_TOKEN: "token_abcdefgh"})
+    assert data[CONF_BACKUP_FOLDER] == DEFAULT_BACKUP_FOLDER
+
+
 @pytest.mark.asyncio
-async def test_token_validation_function(hass: HomeAssistant):
+async def test_token_validation_function(hass: HomeAssistant, mock_async_client):
     """Test the token validation function directly."""
-    with patch("custom_components.yandex_disk_backup.config_flow.AsyncClient") as mock_client_class:
-        mock_client = AsyncMock()
-        mock_client.get_disk_info = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
-
-        # Valid token
-        is_valid = await config_flow._async_validate_token(hass, "valid_token")
-        assert is_valid is True
+    # Valid token
+    is_valid = await config_flow._async_validate_token(hass, "valid_token")
+    assert is_valid is True
 
 
 @pytest.mark.asyncio
-async def test_token_validation_unauthorized(hass: HomeAssistant):
+async def test_token_validation_unauthorized(hass: HomeAssistant, mock_async_client):
     """Test token validation with unauthorized error."""
-    with patch("custom_components.yandex_disk_backup.config_flow.AsyncClient") as mock_client_class:
-        mock_client = AsyncMock()
-        mock_client.get_disk_info.side_effect = UnauthorizedError("Invalid token")
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+    mock_async_client.get_disk_info.side_effect = UnauthorizedError("Invalid token")
+
+    # Invalid token
+    is_valid = await config_flow._async_validate_token(hass, "invalid_token")
+    assert is_valid is False
+
+
+@pytest.mark.asyncio
+async def test_token_validation_cached(hass: HomeAssistant, mock_async_client):
+    """Test that a validation result is reused within the TTL."""
+    with patch(
+        "custom_components.yandex_disk_backup.config_flow.monotonic",
+        return_value=1000.0,
+    ) as mock_monotonic:
+        assert await config_flow._async_validate_token(hass, "valid_token") is True
+        assert await config_flow._async_validate_token(hass, "valid_token") is True
+        assert mock_async_client.get_disk_info.call_count == 1
+
+        mock_monotonic.return_value = 1000.0 + TOKEN_VALIDATION_CACHE_TTL
+        assert await config_flow._async_validate_token(hass, "valid_token") is True
+        assert mock_async_client.get_disk_info.call_count == 2
 
-        # Invalid token
-        is_valid = await config_flow._async_validate_token(hass, "invalid_token")
-        assert is_valid is False
+    # The raw token is not used as the cache key
+    assert "valid_token" not in config_flow._TOKEN_VALIDATION_CACHE
+
+
+@pytest.mark.asyncio
+async def test_token_validation_transient_error_not_cached(
+    hass: HomeAssistant, mock_async_client
+):
+    """Test that transient API errors are retried on the next validation."""
+    mock_async_client.get_disk_info.side_effect = [YaDiskError("Server error"), None]
+
+    assert await config_flow._async_validate_token(hass, "valid_token") is False
+    assert await config_flow._async_validate_token(hass, "valid_token") is True
+
+
+@pytest.mark.asyncio
+async def test_token_validation_unexpected_error_propagates(
+    hass: HomeAssistant, mock_async_client
+):
+    """Test that non-yadisk errors are not reported as an invalid token."""
+    mock_async_client.get_disk_info.side_effect = RuntimeError("Bug")
+
+    with pytest.raises(RuntimeError):
+        await config_flow._async_validate_token(hass, "valid_token")
+
+    assert not config_flow._TOKEN_VALIDATION_CACHE
 
 
 @pytest.mark.asyncio
@@ -218,6 +275,27 @@ async def test_reauth_flow_success(hass: HomeAssistant):
             assert result["reason"] == "reauth_successful"
 
 
+@pytest.mark.asyncio
+async def test_reauth_flow_same_token_uses_cache(
+    hass: HomeAssistant, mock_async_client
+):
+    """Test that resubmitting a recently validated token skips the API call."""
+    flow = config_flow.YandexDiskConfigFlow()
+    flow.hass = hass
+    flow._context = {}
+    token = "same_token_abc123"
+
+    assert await config_flow._async_validate_token(hass, token) is True
+
+    with patch.object(flow, "async_set_unique_id"):
+        await flow.async_step_reauth({CONF_TOKEN: token})
+        result = await flow.async_step_reauth_confirm({CONF_TOKEN: token})
+
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "reauth_successful"
+    assert mock_async_client.get_disk_info.call_count == 1
+
+
 @pytest.mark.asyncio
 async def test_reauth_flow_invalid_token(hass: HomeAssistant):
     """Test reauthentication flow with invalid token."""
@@ -0,0 +1,108 @@
+"""Tests for Yandex Disk backup integration setup."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+import pytest_asyncio
+
+from custom_components.yandex_disk_backup import (
+    async_setup,
+    async_setup_entry,
+    async_unload_entry,
+)
+from custom_components.yandex_disk_backup.const import (
+    CONF_BACKUP_FOLDER,
+    CONF_TOKEN,
+    DATA_BACKUP_AGENT_LISTENERS,
+    DEFAULT_BACKUP_FOLDER,
+)
+
+
+class _FakeSetupEntry:
+    """Config entry stand-in recording its unload and state callbacks."""
+
+    def __init__(self) -> None:
+        self.data = {
+            CONF_TOKEN: "test_token",
+            CONF_BACKUP_FOLDER: DEFAULT_BACKUP_FOLDER,
+        }
+        self.runtime_data = None
+        self.on_unload: list = []
+        self.on_state_change: list = []
+
+    def async_on_unload(self, func) -> None:
+        self.on_unload.append(func)
+
+    def async_on_state_change(self, func):
+        self.on_state_change.append(func)
+        return Mock()
+
+    def run_unload_callbacks(self) -> None:
+        """Run the on_unload callbacks the way ConfigEntry does."""
+        while self.on_unload:
+            self.on_unload.pop()()
+
+
+@pytest.fixture
+def at_started_callbacks():
+    """Capture the callbacks deferred until Home Assistant has started."""
+    callbacks: list = []
+
+    def fake_async_at_started(hass, at_start_cb):
+        callbacks.append(at_start_cb)
+        return Mock()
+
+    with patch(
+        "custom_components.yandex_disk_backup.async_at_started",
+        side_effect=fake_async_at_started,
+    ):
+        yield callbacks
+
+
+@pytest_asyncio.fixture
+async def listener(hass):
+    """Register a backup agent listener after setting up the component."""
+    await async_setup(hass, {})
+    mock_listener = Mock()
+    hass.data[DATA_BACKUP_AGENT_LISTENERS].add(mock_listener)
+    return mock_listener
+
+
+@pytest.mark.asyncio
+async def test_setup_entry_defers_notify_until_started(
+    hass, listener, at_started_callbacks
+):
+    """Test that listeners are notified only once Home Assistant has started."""
+    entry = _FakeSetupEntry()
+
+    assert await async_setup_entry(hass, entry)
+    assert entry.runtime_data is entry.data
+    listener.assert_not_called()
+
+    (at_started,) = at_started_callbacks
+    at_started(hass)
+    listener.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_state_change_notifies_listeners(hass, listener, at_started_callbacks):
+    """Test that a config entry state change notifies listeners."""
+    entry = _FakeSetupEntry()
+    await async_setup_entry(hass, entry)
+
+    (on_state_change,) = entry.on_state_change
+    on_state_change()
+    listener.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_unload_entry_notifies_listeners(hass, listener, at_started_callbacks):
+    """Test that unloading an entry notifies listeners once."""
+    entry = _FakeSetupEntry()
+    await async_setup_entry(hass, entry)
+
+    assert await async_unload_entry(hass, entry)
+    listener.assert_not_called()
+
+    entry.run_unload_callbacks()
+    listener.assert_called_once_with()